@@ -2,6 +2,7 @@
 
 import argparse
 import json
+import sys
 
 import numpy as np
 
@@ -23,11 +24,26 @@ def eval_objective(params: dict) -> dict:
 
 def main():
     parser = argparse.ArgumentParser(description="Simple model.")
-    parser.add_argument("params", type=str, help="Params file.")
-    parser.add_argument("results", type=str, help="Results file.")
+    parser.add_argument("params", type=str, nargs="?", help="Params file, or - to read from stdin.")
+    parser.add_argument("results", type=str, nargs="?", help="Results file.")
+    parser.add_argument(
+        "--persistent",
+        action="store_true",
+        help="Read params as JSON lines from stdin and write results as JSON lines to stdout.",
+    )
     args = parser.parse_args()
 
-    params = json.loads(open(args.params).read())
+    if args.persistent:
+        for line in sys.stdin:
+            results = eval_objective(json.loads(line))
+            sys.stdout.write(json.dumps(results) + "\n")
+            sys.stdout.flush()
+        return
+
+    if args.params == "-":
+        params = json.load(sys.stdin.buffer)
+    else:
+        params = json.loads(open(args.params).read())
     results = eval_objective(params)
     with open(args.results, "w") as f:
         f.write(json.dumps(results))
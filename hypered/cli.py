@@ -26,8 +26,11 @@ def main():
     parser.add_argument("config", type=str, help="Configuration file path.")
     args = parser.parse_args()
 
-    cfg = open(args.config).read()
-    eval(cfg, get_symbols())
+    with open(args.config, "rb") as f:
+        cfg = f.read()
+    # Compile with the file name so that errors point at the config, and exec so that
+    # configs may contain statements (e.g. imports) besides the optimize() call.
+    exec(compile(cfg, args.config, "exec"), get_symbols())
 
 
 if __name__ == "__main__":
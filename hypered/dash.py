@@ -1,15 +1,51 @@
 import argparse
+import hashlib
 import logging
 
 import flask
 
 from .interface.misc import OUTPUT_DIR
 from .server.experiment_loader import ExperimentLoader
+from .utils.dict_utils import serialize_json_bytes
 
 app = flask.Flask(__name__)
 el = ExperimentLoader(OUTPUT_DIR)
 
 
+# The version of the loaded experiments, and the serialized responses and their ETags for it.
+# Requests are served from several threads, so the pair is replaced as a whole when the version
+# changes rather than clearing a dict that another thread may be reading.
+_response_cache = (None, {})
+
+
+def _json_response(key, build):
+    """
+    Returns a JSON response, serializing the data only once per version of the loaded experiments.
+
+    Args:
+        key (tuple): Identifies the response among the routes.
+        build (Callable): Returns the data to serialize.
+
+    Returns:
+        flask.Response: The response, or an empty 304 response if the client has the same data.
+    """
+    global _response_cache
+    version = el.version
+    cached_version, responses = _response_cache
+    if cached_version != version:
+        responses = {}
+        _response_cache = (version, responses)
+    cached = responses.get(key)
+    if cached is None:
+        body = serialize_json_bytes(build(), indent=None)
+        cached = (body, hashlib.blake2b(body, digest_size=16).hexdigest())
+        responses[key] = cached
+    body, etag = cached
+    response = flask.Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response.make_conditional(flask.request)
+
+
 @app.route("/")
 def index():
     el.load_experiments()
@@ -18,28 +54,34 @@ def index():
 
 @app.route("/experiment_groups", methods=["GET"])
 def get_experiment_groups():
-    return flask.jsonify(list(el.experiment_data.keys()))
+    return _json_response(("groups",), lambda: list(el.experiment_data.keys()))
 
 
 @app.route("/experiment_group/<group_name>/names", methods=["GET"])
 def get_experiment_group_names(group_name: str):
-    experiments = el.experiment_data[group_name]
-    variables = list(experiments["params"].keys())
-    metrics = list(experiments["results"].keys())
-    return flask.jsonify({"variables": variables, "metrics": metrics})
+    def build():
+        experiments = el.experiment_data[group_name]
+        variables = list(experiments["params"].keys())
+        metrics = list(experiments["results"].keys())
+        return {"variables": variables, "metrics": metrics}
+
+    return _json_response(("names", group_name), build)
 
 
 @app.route("/experiment_group/<group_name>/data", methods=["GET"])
 def get_experiment_group_data(group_name: str):
-    experiments = el.experiment_data[group_name]
-    variables = experiments["params"]
-    metrics = experiments["results"]
-    if experiments["best"]:
-        best = experiments["best"]
-        best = {"variables": best["params"], "metrics": best["results"]}
-    else:
-        best = None
-    return flask.jsonify({"variables": variables, "metrics": metrics, "best": best})
+    def build():
+        experiments = el.experiment_data[group_name]
+        variables = experiments["params"]
+        metrics = experiments["results"]
+        if experiments["best"]:
+            best = experiments["best"]
+            best = {"variables": best["params"], "metrics": best["results"]}
+        else:
+            best = None
+        return {"variables": variables, "metrics": metrics, "best": best}
+
+    return _json_response(("data", group_name), build)
 
 
 def main():
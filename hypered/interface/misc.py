@@ -5,6 +5,8 @@ for experiments, parameters, and results. It also includes a class for managing
 in a round-robin fashion.
 """
 
+import itertools
+
 from .registry import exportable
 
 OUTPUT_DIR = "experiments"
@@ -86,7 +88,8 @@ class device_id(exportable):
 
     def __init__(self, count: int):
         self.count = count
-        self.index = -1
+        # next() on a cycle is a single C call, which also keeps it atomic across threads.
+        self._cycle = itertools.cycle(range(count))
 
     def __call__(self, ctx) -> int:
         """
@@ -98,5 +101,4 @@ class device_id(exportable):
         Returns:
             int: The next device ID.
         """
-        self.index = (self.index + 1) % self.count
-        return self.index
+        return next(self._cycle)
@@ -4,8 +4,32 @@ This module provides functions to create minimization and maximization objective
 These functions use a utility function to lookup specific metrics from a nested dictionary structure.
 """
 
+import operator
+
 from .registry import export
-from ..utils.dict_utils import lookup_flat
+from ..utils.dict_utils import split_key
+
+
+def _getter(name):
+    """
+    Creates a function that looks up a metric by its flat name.
+
+    Args:
+        name (str): The flat name of the metric (e.g. "eval.loss").
+
+    Returns:
+        function: A function that takes a dictionary of metrics and returns the value of the metric.
+    """
+    path = split_key(name)
+    if len(path) == 1:
+        return operator.itemgetter(path[0])
+
+    def _func(metrics):
+        for k in path:
+            metrics = metrics[k]
+        return metrics
+
+    return _func
 
 
 @export
@@ -20,10 +44,7 @@ def minimize(name):
         function: A function that takes a dictionary of metrics and returns the value of the specified metric.
     """
 
-    def _func(metrics):
-        return lookup_flat(metrics, name)
-
-    return _func
+    return _getter(name)
 
 
 @export
@@ -38,7 +59,9 @@ def maximize(name):
         function: A function that takes a dictionary of metrics and returns the negative value of the specified metric.
     """
 
+    getter = _getter(name)
+
     def _func(metrics):
-        return -lookup_flat(metrics, name)
+        return -getter(metrics)
 
     return _func
@@ -6,23 +6,74 @@ It supports the creation of experiments, managing directories, and executing sub
 
 import logging
 import os
+import queue
 import shlex
 import subprocess
+import threading
 from typing import Callable, Optional
 
+import numpy as np
+
 from . import misc, variable
 from .registry import export
 from ..optim.bayesian_optimization import bayesian_optimization
 from ..utils.dict_utils import (
-    merge_dicts,
+    split_key,
     unwrap_dict,
     wrap_dict,
     serialize_json,
+    serialize_json_bytes,
     deserialize_json,
     hash_json,
+    read_json,
+    write_json,
 )
 
 
+class _Worker:
+    """
+    A long running experiment process.
+
+    The process receives the params of each experiment as a single JSON line on its standard input
+    and replies with the results as a single JSON line on its standard output.
+
+    Args:
+        cmd (str): The command line of the worker process.
+        cwd (str, optional): The current working directory for the process.
+    """
+
+    def __init__(self, cmd: str, cwd: Optional[str] = None):
+        self.popen = subprocess.Popen(
+            shlex.split(cmd),
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def __call__(self, payload: bytes) -> dict:
+        """
+        Run a single experiment on the worker.
+
+        Args:
+            payload (bytes): The compact JSON params passed to the experiment.
+
+        Returns:
+            dict: The results of the experiment.
+        """
+        self.popen.stdin.write(payload + b"\n")
+        self.popen.stdin.flush()
+        line = self.popen.stdout.readline()
+        if not line:
+            raise RuntimeError("Experiment worker exited unexpectedly.")
+        return deserialize_json(line)
+
+    def close(self):
+        """Signal the end of input to the worker and wait for it to exit."""
+        self.popen.stdin.close()
+        self.popen.wait()
+        self.popen.stdout.close()
+
+
 @export
 def optimize(
     name: str,
@@ -37,6 +88,11 @@ def optimize(
     acquisition_fn: str = "UCB",
     optimizer_restarts: int = 5,
     cwd: Optional[str] = None,
+    batched: bool = False,
+    stdin: bool = False,
+    persistent: bool = False,
+    n_jobs: int = 1,
+    seed: Optional[int] = None,
 ):
     """
     Optimize hyperparameters using Gaussian Process minimization.
@@ -54,19 +110,39 @@ def optimize(
         acquisition_fn (str, optional): The type of acquisition function to use. Defaults to "EI".
         optimizer_restarts (int, optional): The number of restarts for the optimizer. Defaults to 5.
         cwd (str, optional): The current working directory for the subprocess. Defaults to None.
+        batched (bool, optional): If True, `function` is called with a list of params and must return a
+            list of results, so that a batch of points (e.g. the random starts) is evaluated at once.
+            Defaults to False.
+        stdin (bool, optional): If True, the params are also piped to the standard input of the binary,
+            so that it does not need to read {params_path}. Defaults to False.
+        persistent (bool, optional): If True, the binary is started once and kept alive for all experiments.
+            It receives the params of each experiment as one JSON line on stdin and must reply with the
+            results as one JSON line on stdout. The binary is run as is, without {params_path} or {results_path}
+            placeholders. Defaults to False.
+        n_jobs (int, optional): The number of experiments run concurrently, at least 1. The random starts are run
+            together and later points are proposed in batches of n_jobs. With `persistent`, up to n_jobs workers
+            are started. Defaults to 1.
+        seed (int, optional): The random seed for reproducibility. Defaults to None.
 
     Returns:
         None
     """
     if binary is None and function is None:
         raise ValueError("Either binary or function must be provided.")
+    if batched and function is None:
+        raise ValueError("Batched evaluation requires a function.")
+    if persistent and binary is None:
+        raise ValueError("Persistent workers require a binary.")
+    if persistent and ("{params_path}" in binary or "{results_path}" in binary):
+        raise ValueError("The binary of persistent workers cannot use {params_path} or {results_path}.")
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be at least 1, got {n_jobs}.")
 
     logging.info("Parameter group: %s", name)
 
     if binary is not None:
         output_dir = os.path.abspath(os.path.join(misc.OUTPUT_DIR, name))
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
 
     unwraped_params = unwrap_dict(params)
 
@@ -78,122 +154,289 @@ def optimize(
             keys.append(k)
             vars.append(v())
 
+    # The nested path of each variable, along with the paths of its parent dicts.
+    key_paths = []
+    for k in keys:
+        path = split_key(k)
+        key_paths.append((tuple(path[: i + 1] for i in range(len(path) - 1)), path[-1]))
+
+    # Top level params that are resolved at evaluation time (e.g. params_path()).
+    # The set of such keys is fixed, so find them once instead of on every call.
+    wraped_template = wrap_dict(unwraped_params)
+    callables = [
+        (k, v)
+        for k, v in wraped_template.items()
+        if callable(v) and not isinstance(v, variable.variable)
+    ]
+
+    # The paths of all the nested dicts of the template, parents first. Each evaluation copies every
+    # one of them, so experiments never share a dict with the template or with each other.
+    dict_paths = []
+    stack = [((), wraped_template)]
+    while stack:
+        path, node = stack.pop()
+        for k, v in node.items():
+            if isinstance(v, dict):
+                dict_paths.append(path + (k,))
+                stack.append((path + (k,), v))
+
+    # Without a binary there are no experiment files, so the paths never change.
+    if binary is None:
+        empty_paths = {"experiment_dir": "", "params_path": "", "results_path": ""}
+
     experiments = []
+    # Persistent workers that are not currently running an experiment, and all the launched workers.
+    idle_workers = queue.SimpleQueue()
+    workers = []
+    workers_lock = threading.Lock()
+    # Objective values of the params evaluated so far, keyed by the hash of the sampled params.
+    # The optimizer often proposes the same point again, which then costs nothing.
+    _cache: dict[str, float] = {}
+    # Events of the params being evaluated, keyed by hash. With n_jobs > 1 a batch may hold the same
+    # params several times, and only the first thread runs the experiment while the others wait for it.
+    _pending: dict[str, threading.Event] = {}
+    _pending_lock = threading.Lock()
 
-    def _eval(values: list):
+    def _prepare(sample_params: dict, sample_hash: str):
         """
-        Evaluate the objective function with the given parameter values.
+        Build the experiment parameters for the given sampled params.
 
         Args:
-            values (list): The list of parameter values to evaluate.
+            sample_params (dict): The flat dictionary of sampled params.
+            sample_hash (str): The hash of the sampled params.
 
         Returns:
-            float: The value of the objective function for the given parameter values.
+            tuple: The sampled params, the full params passed to the experiment and the experiment paths.
         """
-        # Merge base parameters with sampled params
-        sample_params = dict(zip(keys, values))
-        merged_params = merge_dicts(unwraped_params, sample_params)
-        wraped_params = wrap_dict(merged_params)
+        # Copy the template tree with one shallow copy per dict, then set the sampled values
+        # in a single pass over the variables.
+        wraped_params = wraped_template.copy()
+        params_nodes = {(): wraped_params}
+        for path in dict_paths:
+            parent = params_nodes[path[:-1]]
+            params_nodes[path] = parent[path[-1]] = parent[path[-1]].copy()
+        wraped_sample = {}
+        sample_nodes = {(): wraped_sample}
+        for (parents, leaf), value in zip(key_paths, sample_params.values()):
+            sample_node = wraped_sample
+            for parent in parents:
+                child = sample_nodes.get(parent)
+                if child is None:
+                    child = sample_nodes[parent] = sample_node[parent[-1]] = {}
+                sample_node = child
+            sample_node[leaf] = value
+            params_nodes[parents[-1] if parents else ()][leaf] = value
 
-        logging.info(
-            "Evaluating parameters: %s",
-            serialize_json(sample_params, indent=4),
-        )
+        # Only serialize the params for the log when it is actually emitted.
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(
+                "Evaluating parameters: %s",
+                serialize_json(sample_params),
+            )
 
         # Create temporary experiment directory
         if binary is not None:
-            experiment_dir = os.path.join(output_dir, hash_json(sample_params))
-            if not os.path.exists(experiment_dir):
-                os.makedirs(experiment_dir)
+            experiment_dir = os.path.join(output_dir, sample_hash)
+            os.makedirs(experiment_dir, exist_ok=True)
 
             params_path = os.path.join(experiment_dir, "params.json")
             results_path = os.path.join(experiment_dir, "results.json")
+
+            extra_params = {
+                "experiment_dir": experiment_dir,
+                "params_path": params_path,
+                "results_path": results_path,
+            }
         else:
-            experiment_dir = ""
-            params_path = ""
-            results_path = ""
-
-        extra_params = {
-            "experiment_dir": experiment_dir,
-            "params_path": params_path,
-            "results_path": results_path,
-        }
+            extra_params = empty_paths
 
         # Call all callable functions
-        wraped_params = {
-            k: (
-                v({"name": k, "params": wraped_params, **extra_params})
-                if callable(v)
-                else v
+        if callables:
+            wraped_params.update(
+                {k: fn({"name": k, "params": wraped_params, **extra_params}) for k, fn in callables}
             )
-            for k, v in wraped_params.items()
-        }
 
+        return wraped_sample, wraped_params, extra_params
+
+    def _run(wraped_params: dict, extra_params: dict) -> dict:
+        """
+        Run a single experiment.
+
+        Args:
+            wraped_params (dict): The params passed to the experiment.
+            extra_params (dict): The experiment paths.
+
+        Returns:
+            dict: The results of the experiment.
+        """
         if function is not None:
-            results = function(wraped_params)
-        elif binary is not None:
-            # Write params to file
-            with open(params_path, "w") as f:
-                f.write(serialize_json(wraped_params, indent=4))
-
-            # Call subprocess to perform the experiment
-            if not os.path.exists(results_path):
-                logging.info("Launching experiment...")
-                cmd = binary.format(params_path=params_path, results_path=results_path)
-                logging.info(cmd)
-                popen = subprocess.Popen(shlex.split(cmd), cwd=cwd)
-                popen.wait()
-                logging.info("Done.")
-            else:
-                logging.info("Skipping experiment.")
-
-            # Read results
-            with open(results_path) as f:
-                results = deserialize_json(f.read())
+            return function(wraped_params)
+
+        params_path = extra_params["params_path"]
+        results_path = extra_params["results_path"]
+
+        # Write params to file. It is only read by machines, so keep it compact.
+        payload = serialize_json_bytes(wraped_params, indent=None)
+        with open(params_path, "wb") as f:
+            f.write(payload)
+
+        # Reuse the results of an experiment that was already run
+        try:
+            results = read_json(results_path)
+        except FileNotFoundError:
+            pass
+        else:
+            logging.info("Skipping experiment.")
+            return results
+
+        # Call subprocess to perform the experiment
+        if persistent:
+            # At most n_jobs experiments run at a time, so at most n_jobs workers are launched.
+            try:
+                worker = idle_workers.get_nowait()
+            except queue.Empty:
+                logging.info("Launching worker: %s", binary)
+                worker = _Worker(binary, cwd=cwd)
+                with workers_lock:
+                    workers.append(worker)
+            logging.info("Running experiment...")
+            # Only a worker that replied is reused. If it failed, it may be dead, so the next experiment
+            # launches a new worker, and this one is still closed with the others at the end.
+            results = worker(payload)
+            idle_workers.put(worker)
+            write_json(results_path, results, indent=None)
+            logging.info("Done.")
+            return results
+
+        logging.info("Launching experiment...")
+        cmd = binary.format(params_path=params_path, results_path=results_path)
+        logging.info(cmd)
+        if stdin:
+            popen = subprocess.Popen(shlex.split(cmd), cwd=cwd, stdin=subprocess.PIPE)
+            popen.communicate(payload)
         else:
-            raise ValueError("Either binary or function must be provided.")
+            popen = subprocess.Popen(shlex.split(cmd), cwd=cwd)
+            popen.wait()
+        logging.info("Done.")
+
+        # Read results
+        return read_json(results_path)
+
+    def _record(sample_hash: str, wraped_sample: dict, results: dict, extra_params: dict) -> float:
+        """
+        Compute the objective value of an experiment and keep track of it.
+
+        Args:
+            sample_hash (str): The hash of the sampled params of the experiment.
+            wraped_sample (dict): The sampled params of the experiment.
+            results (dict): The results of the experiment.
+            extra_params (dict): The experiment paths.
 
+        Returns:
+            float: The value of the objective function for the experiment.
+        """
         loss_val = objective(results)
+        _cache[sample_hash] = loss_val
 
-        experiments.append(
-            {
-                "params": wrap_dict(sample_params),
-                "results": results,
-                "loss": loss_val,
-                **extra_params,
-            }
-        )
+        experiment = {
+            "params": wraped_sample,
+            "results": results,
+            "loss": loss_val,
+            **extra_params,
+        }
+        experiments.append(experiment)
 
         return loss_val
 
-    bayesian_optimization(
-        _eval,
-        vars,
-        kernel_type=kernel,
-        kernel_scale=kernel_scale,
-        acquisition_fn_type=acquisition_fn,
-        n_initial_points=random_starts,
-        n_calls=iterations,
-        n_optimizer_restarts=optimizer_restarts,
-    )
-
-    # Find the best experiment results
-    best = experiments[0]
-    for exp in experiments:
-        if exp["loss"] < best["loss"]:
-            best = exp
+    def _eval(values: list):
+        """
+        Evaluate the objective function with the given parameter values.
+
+        Args:
+            values (list): The list of parameter values to evaluate.
+
+        Returns:
+            float: The value of the objective function for the given parameter values.
+        """
+        sample_params = dict(zip(keys, values))
+        sample_hash = hash_json(sample_params)
+        while True:
+            with _pending_lock:
+                if sample_hash in _cache:
+                    if logging.getLogger().isEnabledFor(logging.INFO):
+                        logging.info("Skipping duplicate parameters: %s", serialize_json(sample_params))
+                    return _cache[sample_hash]
+                event = _pending.get(sample_hash)
+                if event is None:
+                    event = _pending[sample_hash] = threading.Event()
+                    break
+            # Wait for the thread running the same params, then check the cache again.
+            # If that experiment failed, this thread runs it.
+            event.wait()
+        try:
+            wraped_sample, wraped_params, extra_params = _prepare(sample_params, sample_hash)
+            results = _run(wraped_params, extra_params)
+            return _record(sample_hash, wraped_sample, results, extra_params)
+        finally:
+            with _pending_lock:
+                del _pending[sample_hash]
+            event.set()
+
+    def _eval_batch(values_list: list):
+        """
+        Evaluate the objective function on a batch of parameter values with a single call to `function`.
+
+        Args:
+            values_list (list): The list of parameter values to evaluate.
+
+        Returns:
+            list: The values of the objective function for each of the parameter values.
+        """
+        samples = [dict(zip(keys, values)) for values in values_list]
+        hashes = [hash_json(sample_params) for sample_params in samples]
+        # Only send the params that were not evaluated before to `function`.
+        pending = {}
+        for sample_params, sample_hash in zip(samples, hashes):
+            if sample_hash not in _cache and sample_hash not in pending:
+                pending[sample_hash] = _prepare(sample_params, sample_hash)
+        if pending:
+            results = function([wraped_params for _, wraped_params, _ in pending.values()])
+            for sample_hash, (wraped_sample, _, extra_params), res in zip(pending, pending.values(), results):
+                _record(sample_hash, wraped_sample, res, extra_params)
+        return [_cache[sample_hash] for sample_hash in hashes]
+
+    try:
+        bayesian_optimization(
+            _eval_batch if batched else _eval,
+            vars,
+            kernel_type=kernel,
+            kernel_scale=kernel_scale,
+            acquisition_fn_type=acquisition_fn,
+            n_initial_points=random_starts,
+            n_calls=iterations,
+            n_optimizer_restarts=optimizer_restarts,
+            batched=batched,
+            n_jobs=n_jobs,
+            seed=seed,
+        )
+    finally:
+        for worker in workers:
+            worker.close()
+
+    # The best experiment is found once the run is over rather than tracked in _record, where
+    # updating a running best from the n_jobs threads would race. Skip NaN losses, e.g. of
+    # diverged runs, unless no experiment has a valid loss.
+    losses = np.array([experiment["loss"] for experiment in experiments], dtype=float)
+    best = experiments[int(np.nanargmin(losses)) if not np.isnan(losses).all() else 0]
 
     if binary is not None:
         summary_path = os.path.join(output_dir, "best.json")
-        summary = serialize_json(
-            {
-                "experiment_dir": best["experiment_dir"],
-                "params": best["params"],
-                "results": best["results"],
-            }
-        )
-        logging.info(f"Writing results to {summary_path}:\n{summary}")
-        with open(summary_path, "w") as f:
-            f.write(summary)
+        summary = {
+            "experiment_dir": best["experiment_dir"],
+            "params": best["params"],
+            "results": best["results"],
+        }
+        logging.info(f"Writing results to {summary_path}:\n{serialize_json(summary)}")
+        write_json(summary_path, summary)
     else:
         return best
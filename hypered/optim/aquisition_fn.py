@@ -47,6 +47,25 @@ class AcquisitionFn(ABC):
         """
         pass
 
+    def value_and_grad(self, model, x, y_opt):
+        """
+        Evaluate the acquisition function and its gradient at a single point.
+
+        Subclasses may override this to support gradient based optimization.
+
+        Parameters:
+        model: The surrogate model used for prediction.
+        x (ndarray): The input point, shape (n_features,).
+        y_opt (float): The current best observed value.
+
+        Returns:
+        tuple: The acquisition function value and its gradient with respect to x.
+
+        Raises:
+        NotImplementedError: If the acquisition function does not provide gradients.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide gradients.")
+
 
 class UpperConfidenceBound(AcquisitionFn):
     NAME = "UCB"
@@ -72,10 +91,24 @@ class UpperConfidenceBound(AcquisitionFn):
         Returns:
         ndarray: The evaluated Upper Confidence Bound values.
         """
-        mu, cov = model.predict(x)
-        sigma = np.sqrt(np.diag(cov)).reshape(1, -1)
+        mu, sigma = model.predict(x, return_std=True)
         return mu - self.kappa * sigma
 
+    def value_and_grad(self, model, x, y_opt):
+        """
+        Evaluate the Upper Confidence Bound acquisition function and its gradient at a single point.
+
+        Parameters:
+        model: The surrogate model used for prediction.
+        x (ndarray): The input point, shape (n_features,).
+        y_opt (float): The current best observed value.
+
+        Returns:
+        tuple: The Upper Confidence Bound value and its gradient with respect to x.
+        """
+        mu, sigma, dmu, dsigma = model.predict_with_grad(x)
+        return mu - self.kappa * sigma, dmu - self.kappa * dsigma
+
 class ExpectedImprovement(AcquisitionFn):
     NAME = "EI"
 
@@ -100,9 +133,31 @@ class ExpectedImprovement(AcquisitionFn):
         Returns:
         ndarray: The evaluated Expected Improvement values.
         """
-        mu, cov = model.predict(x)
-        sigma = np.sqrt(np.diag(cov)).reshape(1, -1)
+        mu, sigma = model.predict(x, return_std=True)
         imp = y_opt - mu - self.xi
         Z = imp / sigma
         ei = imp * norm.cdf(Z) + sigma * norm.pdf(Z)
         return -ei
+
+    def value_and_grad(self, model, x, y_opt):
+        """
+        Evaluate the Expected Improvement acquisition function and its gradient at a single point.
+
+        Parameters:
+        model: The surrogate model used for prediction.
+        x (ndarray): The input point, shape (n_features,).
+        y_opt (float): The current best observed value.
+
+        Returns:
+        tuple: The negated Expected Improvement value and its gradient with respect to x.
+        """
+        mu, sigma, dmu, dsigma = model.predict_with_grad(x)
+        imp = y_opt - mu - self.xi
+        if sigma <= 0:
+            return -max(imp, 0.0), (dmu if imp > 0 else np.zeros_like(dmu))
+        Z = imp / sigma
+        cdf = norm.cdf(Z)
+        pdf = norm.pdf(Z)
+        ei = imp * cdf + sigma * pdf
+        # dEI/dmu = -cdf(Z) and dEI/dsigma = pdf(Z)
+        return -ei, cdf * dmu - pdf * dsigma
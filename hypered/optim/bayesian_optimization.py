@@ -1,4 +1,5 @@
-from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 import numpy as np
 from scipy.optimize import minimize
@@ -9,16 +10,40 @@ from .kernel import Kernel
 from .space import Space, Variable
 
 
-def propose_location(acquisition_fn, model, space, y_opt, n_restarts=5):
+def _provides_gradient(acquisition_fn, model):
+    """
+    Check whether the acquisition function and the kernel of the model provide gradients.
+
+    Both are optional hooks of the base classes, so they are supported when a subclass overrides them.
+
+    Parameters:
+    acquisition_fn (AcquisitionFn): The acquisition function.
+    model (GaussianProcess): The Gaussian process model.
+
+    Returns:
+    bool: True if the gradient of the acquisition function can be computed.
+    """
+    return (
+        type(acquisition_fn).value_and_grad is not AcquisitionFn.value_and_grad
+        and type(model.kernel).gradient is not Kernel.gradient
+    )
+
+
+def propose_location(acquisition_fn, model, space, y_opt, n_restarts=5, n_candidates=10000):
     """
     Propose the next location to sample using the acquisition function.
 
+    The acquisition function is first evaluated on a dense random pool of candidates,
+    and the best candidates are used as starting points for the optimizer. When the
+    acquisition function and the kernel provide gradients, they are passed to the optimizer.
+
     Parameters:
     acquisition_fn (Callable): The acquisition function to optimize.
     model (GaussianProcess): The Gaussian process model.
     space (Space): The search space.
     y_opt (float): The current optimal value of the objective function.
     n_restarts (int): The number of restarts for the optimizer.
+    n_candidates (int): The number of random candidates used to pick the starting points.
 
     Returns:
     np.ndarray: The proposed location to sample, reshaped to (1, -1).
@@ -29,8 +54,20 @@ def propose_location(acquisition_fn, model, space, y_opt, n_restarts=5):
     def min_obj(x):
         return acquisition_fn(model, x.reshape(1, -1), y_opt)
 
-    for x0 in space.sample(n_restarts):
-        res = minimize(min_obj, x0=x0, bounds=space.bounds, method="L-BFGS-B")
+    def min_obj_and_grad(x):
+        return acquisition_fn.value_and_grad(model, x, y_opt)
+
+    candidates = space.sample(max(n_candidates, n_restarts))
+    values = acquisition_fn(model, candidates, y_opt)
+    x0s = candidates[np.argsort(values)[:n_restarts]]
+
+    if _provides_gradient(acquisition_fn, model):
+        fun, jac = min_obj_and_grad, True
+    else:
+        fun, jac = min_obj, None
+
+    for x0 in x0s:
+        res = minimize(fun, x0=x0, jac=jac, bounds=space.bounds, method="L-BFGS-B")
         if res.fun < min_val:
             min_val = res.fun
             min_x = res.x
@@ -47,6 +84,9 @@ def bayesian_optimization(
     n_initial_points: int = 10,
     n_calls: int = 100,
     n_optimizer_restarts: int = 5,
+    batched: bool = False,
+    n_jobs: int = 1,
+    seed: Optional[int] = None,
 ):
     """
     Perform Bayesian optimization to minimize the given loss function.
@@ -59,39 +99,87 @@ def bayesian_optimization(
     n_initial_points (int): The number of initial points to sample.
     n_calls (int): The total number of function evaluations.
     n_optimizer_restarts (int): The number of restarts for the acquisition function optimizer.
+    batched (bool): If True, loss_fn takes a list of points and returns a list of their function values.
+    n_jobs (int): The number of points evaluated concurrently. The initial points are evaluated together,
+        and later points are proposed in batches of n_jobs using the constant liar strategy.
+    seed (int, optional): Seed of the random generator used to sample points, for reproducible runs.
 
     Returns:
     list: A list of (x, y) where x are the sampled points and ys are the corresponding function values.
+
+    Raises:
+    ValueError: If n_jobs is smaller than 1.
     """
+    if n_jobs < 1:
+        raise ValueError(f"n_jobs must be at least 1, got {n_jobs}.")
+
     kernel = Kernel.create(kernel_type, scale=kernel_scale)
     model = GaussianProcess(kernel=kernel)
 
     acquisition_fn = AcquisitionFn.create(acquisition_fn_type)
 
-    space = Space(vars)
-
-    xs_n = space.sample(n_initial_points)
-    xs = [space.denormalize(x) for x in xs_n]
-    ys = np.array([loss_fn(x) for x in xs])
-
-    n_iter = n_calls - n_initial_points
-
-    for i in range(n_iter):
-        model.fit(xs_n, ys)
-        y_opt = min(ys)
-        x_n = propose_location(
-            acquisition_fn=acquisition_fn,
-            model=model,
-            space=space,
-            y_opt=y_opt,
-            n_restarts=n_optimizer_restarts,
-        )
-
-        x = space.denormalize(x_n.flatten())
-        y_n = loss_fn(x)
-
-        xs.append(x)
-        xs_n = np.append(xs_n, x_n, axis=0)
-        ys = np.append(ys, y_n)
-
-    return list(zip(xs, ys))
+    space = Space(vars, seed=seed)
+
+    # Evaluations typically wait on external processes, so threads are enough to
+    # run them concurrently, and unlike processes they work with any closure.
+    executor = ThreadPoolExecutor(max_workers=n_jobs) if n_jobs > 1 and not batched else None
+
+    def evaluate(xs):
+        if batched:
+            return list(loss_fn(xs))
+        if executor is not None:
+            return list(executor.map(loss_fn, xs))
+        return [loss_fn(x) for x in xs]
+
+    try:
+        # Preallocate the normalized points and their values for the whole run,
+        # rather than growing the arrays on every iteration.
+        n_total = max(n_calls, n_initial_points)
+        xs_n = np.empty((n_total, space.size))
+        ys = np.empty(n_total)
+
+        space.sample(n_initial_points, out=xs_n[:n_initial_points])
+        xs = space.denormalize_batch(xs_n[:n_initial_points])
+        ys[:n_initial_points] = evaluate(xs)
+
+        model.fit(xs_n[:n_initial_points], ys[:n_initial_points])
+
+        n_evals = n_initial_points
+        y_opt = ys[:n_evals].min()
+        while n_evals < n_calls:
+            batch_size = min(n_jobs, n_calls - n_evals)
+
+            # Propose a batch of points with the constant liar strategy: each proposed
+            # point is temporarily added to the model with y_opt as its value, so that
+            # the next proposal moves away from it.
+            batch_n = []
+            for j in range(batch_size):
+                x_n = propose_location(
+                    acquisition_fn=acquisition_fn,
+                    model=model,
+                    space=space,
+                    y_opt=y_opt,
+                    n_restarts=n_optimizer_restarts,
+                )
+                batch_n.append(x_n)
+                if j < batch_size - 1:
+                    model.add_point(x_n[0], y_opt)
+            if batch_size > 1:
+                model.truncate(n_evals)
+
+            batch = space.denormalize_batch(np.concatenate(batch_n))
+            batch_ys = evaluate(batch)
+
+            for x, x_n, y_n in zip(batch, batch_n, batch_ys):
+                xs.append(x)
+                xs_n[n_evals] = x_n[0]
+                ys[n_evals] = y_n
+                n_evals += 1
+                if y_n < y_opt:
+                    y_opt = y_n
+                model.add_point(x_n[0], y_n)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return list(zip(xs, ys[:n_evals]))
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.linalg import cho_solve, cholesky, solve_triangular
 
 from .kernel import Kernel
 
@@ -10,23 +11,31 @@ class GaussianProcess:
     Attributes:
         kernel (Kernel): Kernel function to compute covariance.
         sigma_n (float): Noise parameter for the Gaussian process.
+        dtype (np.dtype): Floating point type of the training matrices.
     """
 
-    def __init__(self, kernel: Kernel, sigma_n: float = 1e-6):
+    def __init__(self, kernel: Kernel, sigma_n: float = 1e-6, dtype: np.dtype = np.float64):
         """
         Initializes the GaussianProcess with a specified kernel and noise parameter.
 
         Args:
             kernel (Kernel): The kernel function used to compute the covariance matrix.
             sigma_n (float, optional): Observation noise. Defaults to 1e-6.
+            dtype (np.dtype, optional): Floating point type of the training matrices. np.float32 halves the
+                memory traffic of the covariance and Cholesky matrices, but usually needs a larger sigma_n
+                (e.g. 1e-4) to keep the covariance matrix positive definite. Defaults to np.float64.
         """
         self.kernel = kernel
         self.sigma_n = sigma_n
+        self.dtype = np.dtype(dtype)
 
     def fit(self, xs: np.ndarray, ys: np.ndarray):
         """
         Fits the Gaussian Process to the provided training data.
 
+        When xs starts with the current training inputs, as when refitting with more observations,
+        the existing covariance matrix and Cholesky factor are extended instead of recomputed.
+
         Args:
             xs (np.ndarray): Training inputs, shape (n_samples, n_features).
             ys (np.ndarray): Training outputs, shape (n_samples,).
@@ -35,29 +44,222 @@ class GaussianProcess:
             self.xs (np.ndarray): Training inputs.
             self.ys (np.ndarray): Training outputs.
             self.k (np.ndarray): Covariance matrix of the training data.
-            self.k_inv (np.ndarray): Inverse of the covariance matrix.
+            self.k_chol (np.ndarray): Lower triangular Cholesky factor of the covariance matrix.
+            self.alpha (np.ndarray): Solution of k @ alpha = ys.
+        """
+        n = len(xs)
+        if self._extends_fit(xs):
+            self._fit_extension(xs, ys)
+            return
+
+        k = (self.kernel(xs, xs) + self.sigma_n * np.eye(n)).astype(self.dtype, copy=False)
+        k_chol = cholesky(k, lower=True)
+
+        # Training data lives in preallocated buffers so that points can be added
+        # by writing a single row and column instead of copying all matrices.
+        self._xs_buf = np.array(xs, dtype=self.dtype)
+        self._ys_buf = np.array(ys, dtype=self.dtype)
+        self._k_buf = k
+        self._k_chol_buf = k_chol
+        self._set_size(n)
+
+    def _extends_fit(self, xs: np.ndarray):
         """
-        self.xs = xs
-        self.ys = ys
-        self.k = self.kernel(xs, xs) + self.sigma_n * np.eye(len(xs))
-        self.k_inv = np.linalg.inv(self.k)
+        Checks whether the inputs are the current training inputs followed by new ones.
 
-    def predict(self, x: np.ndarray):
+        Args:
+            xs (np.ndarray): Training inputs, shape (n_samples, n_features).
+
+        Returns:
+            bool: True if the current fit can be extended to xs.
+        """
+        prev = getattr(self, "xs", None)
+        return (
+            prev is not None
+            and 0 < len(prev) < len(xs)
+            and np.shape(xs)[1:] == prev.shape[1:]
+            and np.array_equal(prev, np.asarray(xs[: len(prev)], dtype=self.dtype))
+        )
+
+    def _fit_extension(self, xs: np.ndarray, ys: np.ndarray):
+        """
+        Fits the Gaussian Process to training inputs that extend the current ones.
+
+        Only the covariances of the new inputs are computed, and the Cholesky factor is extended
+        block-wise, which takes O(n^2 m) instead of O(n^3) for m new points.
+
+        Args:
+            xs (np.ndarray): Training inputs, shape (n_samples, n_features).
+            ys (np.ndarray): Training outputs, shape (n_samples,).
+        """
+        n_prev = len(self.xs)
+        n = len(xs)
+        xs_new = np.asarray(xs[n_prev:], dtype=self.dtype)
+
+        k = self.kernel.extend(self.k, self.xs, xs_new).astype(self.dtype, copy=False)
+        k[np.arange(n_prev, n), np.arange(n_prev, n)] += self.sigma_n
+
+        # [[L11, 0], [L21, L22]] with L21 = K21 L11^-T and L22 = chol(K22 - L21 L21^T)
+        l21 = solve_triangular(self.k_chol, k[:n_prev, n_prev:], lower=True).T
+        k_chol = np.zeros_like(k)
+        k_chol[:n_prev, :n_prev] = self.k_chol
+        k_chol[n_prev:, :n_prev] = l21
+        k_chol[n_prev:, n_prev:] = cholesky(k[n_prev:, n_prev:] - l21.dot(l21.T), lower=True)
+
+        xs_buf = np.empty((n, xs_new.shape[1]), dtype=self.dtype)
+        xs_buf[:n_prev] = self.xs
+        xs_buf[n_prev:] = xs_new
+        self._xs_buf = xs_buf
+        self._ys_buf = np.array(ys, dtype=self.dtype)
+        self._k_buf = k
+        self._k_chol_buf = k_chol
+        self._set_size(n)
+
+    def add_point(self, x: np.ndarray, y: float):
+        """
+        Adds a single training point to a fitted Gaussian Process.
+
+        Rather than refactorizing the whole covariance matrix, the existing Cholesky factor
+        is extended by one row, which takes O(n^2) instead of O(n^3). Only the covariances
+        between the new point and the training points are computed, and the cached matrices
+        are extended in place.
+
+        Args:
+            x (np.ndarray): New training input, shape (n_features,).
+            y (float): New training output.
+        """
+        x = np.asarray(x, dtype=self.dtype).reshape(1, -1)
+        n = len(self.xs)
+
+        k12 = self.kernel(self.xs, x)[:, 0].astype(self.dtype, copy=False)
+        k22 = self.kernel(x, x)[0, 0] + self.sigma_n
+        l12 = solve_triangular(self.k_chol, k12, lower=True)
+        l22 = np.sqrt(max(k22 - l12.dot(l12), np.finfo(self.dtype).eps))
+
+        self._reserve(n + 1)
+        self._xs_buf[n] = x[0]
+        self._ys_buf[n] = y
+        self._k_buf[n, :n] = k12
+        self._k_buf[:n, n] = k12
+        self._k_buf[n, n] = k22
+        self._k_chol_buf[n, :n] = l12
+        self._k_chol_buf[:n, n] = 0.0
+        self._k_chol_buf[n, n] = l22
+        self._set_size(n + 1)
+
+    def truncate(self, n: int):
+        """
+        Removes all but the first n training points from a fitted Gaussian Process.
+
+        The leading block of a Cholesky factor is the factor of the leading block of the
+        covariance matrix, so no refactorization is needed.
+
+        Args:
+            n (int): The number of training points to keep.
+        """
+        self._set_size(n)
+
+    def _reserve(self, n: int):
+        """
+        Grows the training buffers so that they can hold at least n points.
+
+        The capacity is doubled on each growth, so adding points takes amortized O(n) copies.
+
+        Args:
+            n (int): The number of training points to hold.
+        """
+        capacity = len(self._ys_buf)
+        if n <= capacity:
+            return
+        capacity = max(n, 2 * capacity)
+        size = len(self.ys)
+
+        xs_buf = np.empty((capacity, self._xs_buf.shape[1]), dtype=self.dtype)
+        xs_buf[:size] = self.xs
+        ys_buf = np.empty(capacity, dtype=self.dtype)
+        ys_buf[:size] = self.ys
+        k_buf = np.empty((capacity, capacity), dtype=self.dtype)
+        k_buf[:size, :size] = self.k
+        k_chol_buf = np.empty((capacity, capacity), dtype=self.dtype)
+        k_chol_buf[:size, :size] = self.k_chol
+
+        self._xs_buf = xs_buf
+        self._ys_buf = ys_buf
+        self._k_buf = k_buf
+        self._k_chol_buf = k_chol_buf
+
+    def _set_size(self, n: int):
+        """
+        Points the training data attributes to the first n points and updates alpha.
+
+        Args:
+            n (int): The number of training points.
+        """
+        self.xs = self._xs_buf[:n]
+        self.ys = self._ys_buf[:n]
+        self.k = self._k_buf[:n, :n]
+        self.k_chol = self._k_chol_buf[:n, :n]
+        self.alpha = cho_solve((self.k_chol, True), self.ys)
+
+    def predict(self, x: np.ndarray, return_std: bool = False):
         """
         Predicts the mean and covariance of the Gaussian process at new input points.
 
         Args:
             x (np.ndarray): New input points, shape (n_new_samples, n_features).
+            return_std (bool, optional): Return the standard deviations instead of the full covariance
+                matrix, which avoids computing all n_new_samples^2 covariances. Defaults to False.
 
         Returns:
             tuple: A tuple containing:
                 - mu_s (np.ndarray): Predicted means, shape (n_new_samples,).
-                - cov_s (np.ndarray): Predicted covariances, shape (n_new_samples, n_new_samples).
+                - cov_s (np.ndarray): Predicted covariances, shape (n_new_samples, n_new_samples),
+                  or the standard deviations, shape (n_new_samples,), if return_std is True.
         """
-        k_s = self.kernel(x, self.xs)
-        k_ss = self.kernel(x, x) + self.sigma_n * np.eye(len(x))
+        # Inputs in the GP precision let kernels that preserve the input type skip the cast below.
+        x = np.asarray(x, dtype=self.dtype)
+        k_s = self.kernel(x, self.xs).astype(self.dtype, copy=False)
+        v = cho_solve((self.k_chol, True), k_s.T)
+
+        mu_s = k_s.dot(self.alpha)
 
-        mu_s = k_s.dot(self.k_inv).dot(self.ys)
-        cov_s = k_ss - k_s.dot(self.k_inv).dot(k_s.T)
+        if return_std:
+            var_s = self.kernel.diag(x) + self.sigma_n - np.einsum("ij,ji->i", k_s, v)
+            return mu_s, np.sqrt(np.maximum(var_s, 0.0))
+
+        k_ss = self.kernel(x, x) + self.sigma_n * np.eye(len(x))
+        cov_s = k_ss - k_s.dot(v)
 
         return mu_s, cov_s
+
+    def predict_with_grad(self, x: np.ndarray):
+        """
+        Predicts the mean and standard deviation of the Gaussian process at a single input point, along with
+        their gradients with respect to the input.
+
+        The kernel must be stationary, so that the prior variance does not depend on the input, and must
+        implement `Kernel.gradient`.
+
+        Args:
+            x (np.ndarray): New input point, shape (n_features,).
+
+        Returns:
+            tuple: A tuple containing:
+                - mu (float): Predicted mean.
+                - sigma (float): Predicted standard deviation.
+                - dmu (np.ndarray): Gradient of the mean, shape (n_features,).
+                - dsigma (np.ndarray): Gradient of the standard deviation, shape (n_features,).
+        """
+        x = np.asarray(x).ravel()
+        k_s, dk_s = self.kernel.gradient(x, self.xs)
+        v = cho_solve((self.k_chol, True), k_s)
+
+        mu = k_s.dot(self.alpha)
+        dmu = dk_s.T.dot(self.alpha)
+
+        var = self.kernel.diag(x.reshape(1, -1))[0] + self.sigma_n - k_s.dot(v)
+        sigma = np.sqrt(max(var, 0.0))
+        # d(var)/dx = -2 dk_s^T K^-1 k_s, and d(sigma)/dx = d(var)/dx / (2 sigma).
+        dsigma = -dk_s.T.dot(v) / sigma if sigma > 0 else np.zeros_like(x)
+
+        return mu, sigma, dmu, dsigma
@@ -1,9 +1,102 @@
 from abc import ABC, abstractmethod
+import functools
+import math
+from typing import Any, Callable, Optional
+
 import numpy as np
-from scipy.spatial.distance import cdist
+
+_SQRT3 = math.sqrt(3.0)
+_SQRT5 = math.sqrt(5.0)
+
+# Number of kernel matrix entries computed per block, 256 KiB in double precision,
+# so that a block stays in the L2 cache between the distance and the transform passes.
+_BLOCK_SIZE = 1 << 15
+
+
+def _sq_distance(
+    x1: np.ndarray,
+    x2: np.ndarray,
+    factor: float = 1.0,
+    transform: Optional[Callable[[np.ndarray], Any]] = None,
+):
+    """
+    Computes the scaled squared euclidean distances between two sets of inputs.
+
+    Uses the expansion |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, with the norms folded into two extra
+    columns of the inputs, so that all the work is a matrix product handled by BLAS.
+    The factor is applied to the (n1, n_features + 2) operand rather than to the result.
+
+    The product is computed in blocks of rows, and the optional transform is applied to each
+    block right after it is computed, while it is still in cache, rather than in a second pass
+    over the full matrix.
+
+    Args:
+        x1 (np.ndarray): The first input array, shape (n1, n_features).
+        x2 (np.ndarray): The second input array, shape (n2, n_features).
+        factor (float): The factor the squared distances are multiplied by. Defaults to 1.
+        transform (Callable, optional): Function transforming a block of distances in place.
+
+    Returns:
+        np.ndarray: The scaled squared distances, shape (n1, n2). Single precision inputs give single
+        precision distances, anything else is computed in double precision.
+    """
+    # Keep float32 inputs in float32 so that BLAS runs the single precision product,
+    # which processes twice as many values per vector instruction.
+    dtype = np.result_type(x1, x2, np.float32)
+    x1 = np.ascontiguousarray(x1, dtype=dtype)
+    x2 = np.ascontiguousarray(x2, dtype=dtype)
+    a = np.empty((len(x1), x1.shape[1] + 2), dtype=dtype)
+    np.multiply(x1, -2.0 * factor, out=a[:, :-2])
+    a[:, -2] = np.einsum("ij,ij->i", x1, x1)
+    a[:, -2] *= factor
+    a[:, -1] = factor
+    b = np.empty((len(x2), x2.shape[1] + 2), dtype=dtype)
+    b[:, :-2] = x2
+    b[:, -2] = 1.0
+    b[:, -1] = np.einsum("ij,ij->i", x2, x2)
+    b = b.T
+    d = np.empty((len(x1), len(x2)), dtype=dtype)
+    rows = max(1, _BLOCK_SIZE // max(1, len(x2)))
+    for start in range(0, len(x1), rows):
+        block = d[start:start + rows]
+        np.dot(a[start:start + rows], b, out=block)
+        # Rounding can make the distance between close points slightly negative.
+        if factor >= 0:
+            np.maximum(block, 0.0, out=block)
+        else:
+            np.minimum(block, 0.0, out=block)
+        if transform is not None:
+            transform(block)
+    return d
+
+
+def _exp_neg(x: np.ndarray):
+    """
+    Computes the exponential of an array of non-positive values in place.
+
+    The arguments are clamped so that the results never fall in the subnormal range, where
+    the exponential takes a much slower path. The clamped results are below 1e-30, which is
+    far smaller than the noise added to any kernel matrix.
+
+    Args:
+        x (np.ndarray): The floating point array, overwritten with the result.
+
+    Returns:
+        np.ndarray: The array x.
+    """
+    np.maximum(x, _exp_lower_bound(x.dtype), out=x)
+    return np.exp(x, out=x)
+
+
+@functools.lru_cache(maxsize=None)
+def _exp_lower_bound(dtype: np.dtype):
+    """Returns the smallest argument whose exponential is comfortably a normal number of the given type."""
+    return math.log(np.finfo(dtype).tiny) + 8.0
 
 
 class Kernel(ABC):
+    # Kernels only hold a few scalars, so they do without a per-instance __dict__.
+    __slots__ = ()
     _registry = {}
 
     def __init_subclass__(cls, **kwargs):
@@ -46,9 +139,69 @@ class Kernel(ABC):
         """
         pass
 
+    def diag(self, x: np.ndarray):
+        """
+        Computes the diagonal of the kernel matrix of a set of inputs with itself.
+
+        Subclasses should override this to avoid computing the full kernel matrix.
+
+        Args:
+            x (np.ndarray): The input array.
+
+        Returns:
+            np.ndarray: The diagonal of the kernel matrix.
+        """
+        return np.diag(self(x, x))
+
+    def extend(self, k_prev: np.ndarray, xs_old: np.ndarray, xs_new: np.ndarray):
+        """
+        Extends the kernel matrix of a set of inputs with new inputs.
+
+        Only the blocks involving the new inputs are computed, the existing block is copied from k_prev.
+
+        Args:
+            k_prev (np.ndarray): The kernel matrix of xs_old with itself, shape (n_old, n_old).
+            xs_old (np.ndarray): The existing inputs, shape (n_old, n_features).
+            xs_new (np.ndarray): The new inputs, shape (n_new, n_features).
+
+        Returns:
+            np.ndarray: The kernel matrix of the concatenated inputs, shape (n_old + n_new, n_old + n_new).
+        """
+        n = len(xs_old)
+        k12 = self(xs_old, xs_new)
+        k = np.empty((n + len(xs_new),) * 2, dtype=np.result_type(k_prev, k12))
+        k[:n, :n] = k_prev
+        k[:n, n:] = k12
+        k[n:, :n] = k12.T
+        k[n:, n:] = self(xs_new, xs_new)
+        return k
+
+    def gradient(self, x: np.ndarray, x2: np.ndarray):
+        """
+        Computes the kernel between a single input and a set of inputs, and its gradient with respect to
+        the single input.
+
+        Subclasses may override this to support gradient based optimization of acquisition functions.
+
+        Args:
+            x (np.ndarray): The single input, shape (n_features,).
+            x2 (np.ndarray): The set of inputs, shape (n_samples, n_features).
+
+        Returns:
+            tuple: A tuple containing:
+                - k (np.ndarray): The kernel values, shape (n_samples,).
+                - dk (np.ndarray): The gradients of the kernel values with respect to x, shape
+                  (n_samples, n_features).
+
+        Raises:
+            NotImplementedError: If the kernel does not provide gradients.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide gradients.")
+
 
 class RBF(Kernel):
     NAME = "RBF"
+    __slots__ = ("scale", "_inv_scale2", "_neg_half_inv_scale2")
 
     def __init__(self, scale=1.0):
         """
@@ -58,6 +211,8 @@ class RBF(Kernel):
             scale (float): The scale parameter of the RBF kernel.
         """
         self.scale = scale
+        self._inv_scale2 = 1.0 / scale**2
+        self._neg_half_inv_scale2 = -0.5 * self._inv_scale2
 
     def __call__(self, x1: np.ndarray, x2: np.ndarray):
         """
@@ -70,16 +225,46 @@ class RBF(Kernel):
         Returns:
             np.ndarray: The RBF kernel matrix.
         """
-        distance = cdist(
-            x1 / self.scale,
-            x2 / self.scale,
-            metric="sqeuclidean",
-        )
-        return np.exp(-0.5 * distance)
+        # The scale is folded into the operands of the distance product, and the
+        # exponential is applied in place, so no temporary n x m arrays are created.
+        return _sq_distance(x1, x2, self._neg_half_inv_scale2, _exp_neg)
+
+    def diag(self, x: np.ndarray):
+        """
+        Computes the diagonal of the RBF kernel matrix of a set of inputs with itself.
+
+        Args:
+            x (np.ndarray): The input array.
+
+        Returns:
+            np.ndarray: The diagonal of the kernel matrix, which is all ones.
+        """
+        return np.ones(len(x))
+
+    def gradient(self, x: np.ndarray, x2: np.ndarray):
+        """
+        Computes the RBF kernel between a single input and a set of inputs, and its gradient with respect to
+        the single input.
+
+        Args:
+            x (np.ndarray): The single input, shape (n_features,).
+            x2 (np.ndarray): The set of inputs, shape (n_samples, n_features).
+
+        Returns:
+            tuple: The kernel values, shape (n_samples,), and their gradients, shape (n_samples, n_features).
+        """
+        delta = x - x2
+        diff = delta * self._inv_scale2
+        k = np.exp(-0.5 * np.einsum("ij,ij->i", diff, delta))
+        return k, -diff * k[:, None]
 
 
 class Matern(Kernel):
     NAME = "Matern"
+    __slots__ = ("nu", "scale", "_inv_scale2", "_distance_factor")
+
+    # Factor of the squared scaled distance in the exponent of each closed form.
+    _NU_FACTORS = {0.5: 1.0, 1.5: 3.0, 2.5: 5.0}
 
     def __init__(self, nu: float = 1.5, scale: float = 1.0):
         """
@@ -91,6 +276,9 @@ class Matern(Kernel):
         """
         self.nu = nu
         self.scale = scale
+        self._inv_scale2 = 1.0 / scale**2
+        factor = self._NU_FACTORS.get(nu)
+        self._distance_factor = None if factor is None else factor * self._inv_scale2
 
     def __call__(self, x1: np.ndarray, x2: np.ndarray):
         """
@@ -106,19 +294,84 @@ class Matern(Kernel):
         Raises:
             ValueError: If nu is not one of the supported values (0.5, 1.5, 2.5).
         """
-        distance = cdist(
-            x1 / self.scale,
-            x2 / self.scale,
-            metric="euclidean",
-        )
+        if self._distance_factor is None:
+            raise ValueError("Unsupported value for nu. Use 0.5, 1.5, or 2.5.")
+        # The distances come from the same BLAS product as the RBF kernel, with the scale
+        # and the sqrt(3) or sqrt(5) of the closed form folded into its operands.
+        return _sq_distance(x1, x2, self._distance_factor, self._closed_form)
+
+    def _closed_form(self, d: np.ndarray):
+        """
+        Evaluates the closed form of the kernel in place on a block of squared distances.
+
+        Args:
+            d (np.ndarray): The squared distances, scaled by _distance_factor.
+        """
+        np.sqrt(d, out=d)
+        if self.nu == 0.5:
+            # exp(-d) with d = r
+            np.negative(d, out=d)
+            _exp_neg(d)
+        elif self.nu == 1.5:
+            # (1 + d) * exp(-d) with d = sqrt(3) * r
+            e = np.negative(d)
+            _exp_neg(e)
+            d += 1.0
+            d *= e
+        else:
+            # (1 + d + d^2 / 3) * exp(-d) with d = sqrt(5) * r
+            poly = np.multiply(d, d)
+            poly *= 1.0 / 3.0
+            poly += d
+            poly += 1.0
+            np.negative(d, out=d)
+            _exp_neg(d)
+            d *= poly
+
+    def diag(self, x: np.ndarray):
+        """
+        Computes the diagonal of the Matern kernel matrix of a set of inputs with itself.
+
+        Args:
+            x (np.ndarray): The input array.
+
+        Returns:
+            np.ndarray: The diagonal of the kernel matrix, which is all ones.
+        """
+        return np.ones(len(x))
+
+    def gradient(self, x: np.ndarray, x2: np.ndarray):
+        """
+        Computes the Matern kernel between a single input and a set of inputs, and its gradient with respect to
+        the single input.
+
+        Args:
+            x (np.ndarray): The single input, shape (n_features,).
+            x2 (np.ndarray): The set of inputs, shape (n_samples, n_features).
+
+        Returns:
+            tuple: The kernel values, shape (n_samples,), and their gradients, shape (n_samples, n_features).
+
+        Raises:
+            ValueError: If nu is not one of the supported values (0.5, 1.5, 2.5).
+        """
+        delta = x - x2
+        diff = delta * self._inv_scale2
+        distance = np.sqrt(np.einsum("ij,ij->i", diff, delta))
 
+        # dk/dx = dk/dr * diff / r, written so that the gradient at r = 0 is well defined where it exists.
         if self.nu == 0.5:
-            return np.exp(-distance)
+            k = np.exp(-distance)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = np.where(distance > 0, -k / distance, 0.0)
         elif self.nu == 1.5:
-            return (1 + np.sqrt(3) * distance) * np.exp(-np.sqrt(3) * distance)
+            e = np.exp(-_SQRT3 * distance)
+            k = (1 + _SQRT3 * distance) * e
+            scale = -3.0 * e
         elif self.nu == 2.5:
-            return (
-                1 + np.sqrt(5) * distance + (5.0 / 3.0) * np.square(distance)
-            ) * np.exp(-np.sqrt(5) * distance)
+            e = np.exp(-_SQRT5 * distance)
+            k = (1 + _SQRT5 * distance + (5.0 / 3.0) * (distance * distance)) * e
+            scale = -(5.0 / 3.0) * (1 + _SQRT5 * distance) * e
         else:
             raise ValueError("Unsupported value for nu. Use 0.5, 1.5, or 2.5.")
+        return k, diff * scale[:, None]
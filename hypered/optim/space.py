@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Optional
+
 import numpy as np
 
 
@@ -97,34 +99,64 @@ class Categorical(Variable):
         Returns:
         str: Denormalized categorical value.
         """
+        if self.size <= 16:
+            # For a few categories a Python scan is cheaper than the overhead of np.argmax.
+            # list.index returns the first maximum, like np.argmax.
+            values = x.tolist()
+            return self.categories[values.index(max(values))]
         return self.categories[np.argmax(x)]
 
 
 class Space:
-    def __init__(self, vars: list[Variable]):
+    def __init__(self, vars: list[Variable], seed: Optional[int] = None):
         """
         Initialize a Space instance with a list of variables.
 
         Parameters:
         vars (list[Variable]): List of variables defining the space.
+        seed (int, optional): Seed of the random generator used for sampling.
         """
         self.vars = vars
+        self._rng = np.random.default_rng(seed)
         self.n = len(vars)
         self.inds = self._compute_inds(vars)
         self.size = sum([var.size for var in vars])
-        self.bounds = [(0, 1) for _ in range(self.size)]
-
-    def sample(self, n: int):
+        self.bounds = np.tile([[0.0, 1.0]], (self.size, 1))
+
+        # Real and Integer variables are denormalized together with one NumPy operation,
+        # so keep their columns and ranges as arrays. Subclasses may override denormalize,
+        # so they go through their own method.
+        numeric = [
+            (i, ind.start, var)
+            for i, (var, ind) in enumerate(zip(vars, self.inds))
+            if type(var) in (Real, Integer)
+        ]
+        self._numeric_pos = [i for i, _, _ in numeric]
+        self._numeric_cols = np.array([col for _, col, _ in numeric], dtype=int)
+        self._numeric_low = np.array([var.low for _, _, var in numeric], dtype=float)
+        self._numeric_span = np.array([var.high - var.low for _, _, var in numeric], dtype=float)
+        self._numeric_is_int = [type(var) is Integer for _, _, var in numeric]
+        # Positions of the remaining variables, which are denormalized one by one.
+        numeric_pos = set(self._numeric_pos)
+        self._other_pos = [i for i in range(self.n) if i not in numeric_pos]
+
+    def sample(self, n: int, out: Optional[np.ndarray] = None):
         """
         Sample n points uniformly from the space.
 
         Parameters:
         n (int): Number of points to sample.
+        out (np.ndarray, optional): C-contiguous float64 array of shape (n, size) to sample into,
+            to avoid allocating a new array.
 
         Returns:
         np.ndarray: Array of sampled points.
         """
-        return np.random.uniform(0, 1, size=(n, self.size))
+        if out is not None:
+            if out.shape != (n, self.size):
+                raise ValueError(f"Expected an output array of shape {(n, self.size)}, got {out.shape}.")
+            return self._rng.random(out=out)
+        return self._rng.random((n, self.size))
 
     def denormalize(self, xs):
         """
@@ -136,7 +168,46 @@ class Space:
         Returns:
         list: List of denormalized values for each variable.
         """
-        return [var.denormalize(xs[ind]) for var, ind in zip(self.vars, self.inds)]
+        xs = np.asarray(xs)
+        out = [None] * self.n
+        if self._numeric_pos:
+            # All Real and Integer variables are scaled with a single NumPy operation.
+            values = (xs[self._numeric_cols] * self._numeric_span + self._numeric_low).tolist()
+            for pos, is_int, value in zip(self._numeric_pos, self._numeric_is_int, values):
+                out[pos] = int(value) if is_int else value
+        for pos in self._other_pos:
+            out[pos] = self.vars[pos].denormalize(xs[self.inds[pos]])
+        return out
+
+    def denormalize_batch(self, xs: np.ndarray):
+        """
+        Denormalize a batch of normalized points.
+
+        Equivalent to calling denormalize on each row of xs, but the values of each
+        variable are computed for all points at once.
+
+        Parameters:
+        xs (np.ndarray): Array of shape (n, size) of normalized points.
+
+        Returns:
+        list[list]: List of denormalized values for each point.
+        """
+        xs = np.asarray(xs)
+        columns = [None] * self.n
+        if self._numeric_pos:
+            values = xs[:, self._numeric_cols] * self._numeric_span + self._numeric_low
+            for j, (pos, is_int) in enumerate(zip(self._numeric_pos, self._numeric_is_int)):
+                column = values[:, j]
+                columns[pos] = (column.astype(int) if is_int else column).tolist()
+        for pos in self._other_pos:
+            var, ind = self.vars[pos], self.inds[pos]
+            if type(var) is Categorical:
+                columns[pos] = [var.categories[i] for i in np.argmax(xs[:, ind], axis=1).tolist()]
+            else:
+                columns[pos] = [var.denormalize(x) for x in xs[:, ind]]
+        if not columns:
+            return [[] for _ in range(len(xs))]
+        return [list(row) for row in zip(*columns)]
 
     @staticmethod
     def _compute_inds(vars: list[Variable]):
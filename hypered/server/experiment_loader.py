@@ -1,57 +1,143 @@
-import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from ..utils.dict_utils import join_dicts
+from ..utils.dict_utils import join_dicts, read_json
 
 
 class ExperimentLoader:
     experiment_data = {}
+    # Incremented whenever experiment_data changes, so that consumers can cache derived data.
+    version = 0
 
     def __init__(self, directory):
         super().__init__()
         self.directory = directory
+        # Maps experiment paths to (file versions, params, results) so that unchanged
+        # experiments are not parsed again on every refresh.
+        self._cache = {}
+        # Maps group paths to (version of all the group files, group data) so that
+        # unchanged groups are not joined again on every refresh.
+        self._group_cache = {}
+        # Refreshes may come from concurrent requests, only run one at a time.
+        self._lock = threading.RLock()
+        # Threads that overlap file reads and JSON parsing across experiments, started on first use.
+        self._executor = None
 
     def load_experiments(self):
-        self.experiment_data = {}
-        if not os.path.exists(self.directory):
-            print("Directory does not exist")
-            return
-        for experiment_group in os.listdir(self.directory):
-            group_data = self.load_experiment_group(experiment_group)
-            if group_data is None:
-                continue
-            self.experiment_data[experiment_group] = group_data
+        with self._lock:
+            experiment_data = {}
+            try:
+                # DirEntry.is_dir uses the file type from the directory listing, without a stat per entry.
+                groups = [entry for entry in os.scandir(self.directory) if entry.is_dir()]
+            except FileNotFoundError:
+                print("Directory does not exist")
+                groups = []
+            # Load the experiments of all groups in a single batch, so that small groups
+            # do not leave the threads idle.
+            group_paths = [self._list_experiments(entry.path) for entry in groups]
+            experiments = self._map_experiments([path for paths in group_paths for path in paths])
+            start = 0
+            for entry, paths in zip(groups, group_paths):
+                group_experiments = experiments[start:start + len(paths)]
+                start += len(paths)
+                experiment_data[entry.name] = self._join_experiment_group(entry.path, paths, group_experiments)
+            # Unchanged groups are returned as the same objects by load_experiment_group.
+            changed = experiment_data.keys() != self.experiment_data.keys() or any(
+                group_data is not self.experiment_data[group] for group, group_data in experiment_data.items()
+            )
+            # Swap the data in one step, so that readers never see a partially loaded state.
+            self.experiment_data = experiment_data
+            if changed:
+                self.version += 1
+            # Forget the experiments and groups that were deleted since the last refresh.
+            experiment_paths = {path for paths in group_paths for path in paths}
+            self._cache = {path: cached for path, cached in self._cache.items() if path in experiment_paths}
+            group_dirs = {entry.path for entry in groups}
+            self._group_cache = {path: cached for path, cached in self._group_cache.items() if path in group_dirs}
 
     def load_experiment_group(self, experiment_group):
         group_path = os.path.join(self.directory, experiment_group)
         if not os.path.isdir(group_path):
             return None
-        params_list = []
-        results_list = []
-        for experiment in os.listdir(group_path):
-            experiment_path = os.path.join(group_path, experiment)
-            params, results = self.load_experiment(experiment_path)
-            if params is None or results is None:
-                continue
-            params_list.append(params)
-            results_list.append(results)
-        params = join_dicts(params_list)
-        results = join_dicts(results_list)
-        best_path = os.path.join(group_path, "best.json")
-        if os.path.exists(best_path):
-            with open(best_path) as best_file:
-                best = json.load(best_file)
-        else:
-            best = None
-        return {"params": params, "results": results, "best": best}
+        experiment_paths = self._list_experiments(group_path)
+        with self._lock:
+            experiments = self._map_experiments(experiment_paths)
+            return self._join_experiment_group(group_path, experiment_paths, experiments)
+
+    @staticmethod
+    def _list_experiments(group_path: str):
+        # Only directories hold experiments, which skips best.json without touching it.
+        return [entry.path for entry in os.scandir(group_path) if entry.is_dir()]
+
+    def _map_experiments(self, experiment_paths: list):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return list(self._executor.map(self._load_experiment, experiment_paths))
+
+    def _join_experiment_group(self, group_path: str, experiment_paths: list, experiments: list):
+        with self._lock:
+            best_path = os.path.join(group_path, "best.json")
+            try:
+                best_stat = os.stat(best_path)
+                best_version = (best_stat.st_mtime_ns, best_stat.st_size)
+            except FileNotFoundError:
+                best_version = None
+
+            version = (
+                tuple((path, versions) for path, (versions, _, _) in zip(experiment_paths, experiments) if versions),
+                best_version,
+            )
+            cached = self._group_cache.get(group_path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            params_list = []
+            results_list = []
+            for _, params, results in experiments:
+                if params is None or results is None:
+                    continue
+                params_list.append(params)
+                results_list.append(results)
+            params = join_dicts(params_list)
+            results = join_dicts(results_list)
+            try:
+                best = read_json(best_path)
+            except FileNotFoundError:
+                best = None
+            group_data = {"params": params, "results": results, "best": best}
+            self._group_cache[group_path] = (version, group_data)
+            return group_data
 
     def load_experiment(self, experiment_path: str):
+        _, params, results = self._load_experiment(experiment_path)
+        return params, results
+
+    def _load_experiment(self, experiment_path: str):
         params_path = os.path.join(experiment_path, "params.json")
         results_path = os.path.join(experiment_path, "results.json")
-        if not os.path.exists(params_path) or not os.path.exists(results_path):
-            return None, None
-        with open(params_path) as params_file:
-            params = json.load(params_file)
-        with open(results_path) as results_file:
-            results = json.load(results_file)
-        return params, results
+        # A single stat per file both checks that it exists and identifies its version.
+        try:
+            params_stat = os.stat(params_path)
+            results_stat = os.stat(results_path)
+        except (FileNotFoundError, NotADirectoryError):
+            # Not an experiment directory, or an experiment that has not finished yet.
+            self._cache.pop(experiment_path, None)
+            return None, None, None
+        versions = (
+            params_stat.st_mtime_ns,
+            params_stat.st_size,
+            results_stat.st_mtime_ns,
+            results_stat.st_size,
+        )
+        cached = self._cache.get(experiment_path)
+        if cached is not None and cached[0] == versions:
+            return cached
+        try:
+            params = read_json(params_path)
+            results = read_json(results_path)
+        except FileNotFoundError:
+            self._cache.pop(experiment_path, None)
+            return None, None, None
+        self._cache[experiment_path] = (versions, params, results)
+        return versions, params, results
@@ -2,9 +2,77 @@
 
 from typing import Any, Optional, Callable
 
-import ast
+import functools
 import hashlib
-import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+if orjson is not None:
+    # Options shared by every orjson call: numpy scalars/arrays show up in results
+    # and stdlib json accepted non-string keys, so keep both working.
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    _loads = orjson.loads
+
+    def _dumps(data: Any, indent: Optional[int] = None, sort_keys: bool = False) -> bytes:
+        option = _ORJSON_OPTIONS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, option=option)
+
+else:
+
+    def _json_default(obj: Any) -> Any:
+        # Mirror orjson's numpy support for scalars and arrays.
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+    def _loads(text: Any) -> Any:
+        return json.loads(bytes(text) if isinstance(text, memoryview) else text)
+
+    def _str_keys(data: Any) -> Any:
+        # orjson sorts keys after converting them to strings, while json cannot sort mixed key types.
+        if isinstance(data, dict):
+            return {k if isinstance(k, str) else json.dumps(k): _str_keys(v) for k, v in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [_str_keys(v) for v in data]
+        return data
+
+    def _dumps(data: Any, indent: Optional[int] = None, sort_keys: bool = False) -> bytes:
+        # Match the output of orjson: no spaces in compact output and raw UTF-8.
+        separators = (",", ": ") if indent else (",", ":")
+        return json.dumps(
+            _str_keys(data) if sort_keys else data,
+            indent=indent,
+            separators=separators,
+            ensure_ascii=False,
+            sort_keys=sort_keys,
+            default=_json_default,
+        ).encode()
+
+
+@functools.lru_cache(maxsize=1024)
+def split_key(flat_key: str, sep: str = ".") -> tuple[str, ...]:
+    """
+    Splits a flattened key into its path components.
+
+    The set of keys is fixed for a given parameter tree, so results are memoized.
+
+    Args:
+        flat_key (str): The flattened key to split.
+        sep (str, optional): The separator used between nested keys. Defaults to ".".
+
+    Returns:
+        tuple[str, ...]: The path components of the key.
+    """
+    return tuple(flat_key.split(sep))
 
 
 def unwrap_dict(
@@ -27,12 +95,20 @@ def unwrap_dict(
     """
     if flat is None:
         flat = {}
-    for k, v in dic.items():
-        flat_suffix = suffix + sep + k if suffix else k
-        if isinstance(v, dict):
-            unwrap_dict(v, flat, flat_suffix)
+    # Walk the tree with an explicit stack of item iterators instead of recursing,
+    # which keeps the traversal order while avoiding a Python frame per nested dict.
+    # Paths are kept as tuples and only joined into a flat key at the leaves.
+    stack = [((suffix,) if suffix else (), iter(dic.items()))]
+    while stack:
+        path, items = stack[-1]
+        for k, v in items:
+            # Plain dicts are the common case, check for them before falling back to isinstance.
+            if type(v) is dict or isinstance(v, dict):
+                stack.append((path + (k,), iter(v.items())))
+                break
+            flat[sep.join(path + (k,)) if path else k] = v
         else:
-            flat[flat_suffix] = v
+            stack.pop()
     return flat
 
 
@@ -58,7 +134,7 @@ def wrap_dict(
         dic = {}
     for k, v in flat.items():
         p = dic
-        keys = k.split(sep)
+        keys = split_key(k, sep)
         for k in keys[:-1]:
             if k not in p:
                 p[k] = {}
@@ -78,10 +154,11 @@ def merge_dicts(base: dict, *args) -> dict:
     Returns:
         dict: The merged dictionary.
     """
+    if len(args) == 1:
+        return base | args[0]
     merged = base.copy()
     for arg in args:
-        for k, v in arg.items():
-            merged[k] = v
+        merged.update(arg)
     return merged
 
 
@@ -98,10 +175,22 @@ def join_dicts(objs: list[Any], fn: Callable = list):
     """
     if not objs:
         return {}
-    if isinstance(objs[0], dict):
-        return {k: join_dicts([obj[k] for obj in objs], fn=fn) for k in objs[0].keys()}
-    else:
+    if not isinstance(objs[0], dict):
         return fn(objs)
+    # Walk the structure of the first object with an explicit stack instead of recursing.
+    # Keys are used as is, so dotted keys and empty sub-dictionaries are kept.
+    joined = {}
+    stack = [(joined, objs)]
+    while stack:
+        out, group = stack.pop()
+        for k in group[0]:
+            values = [obj[k] for obj in group]
+            if isinstance(values[0], dict):
+                out[k] = {}
+                stack.append((out[k], values))
+            else:
+                out[k] = fn(values)
+    return joined
 
 
 def lookup_flat(dic: dict, flat_key: str, sep: str = ".") -> Any:
@@ -117,47 +206,113 @@ def lookup_flat(dic: dict, flat_key: str, sep: str = ".") -> Any:
         Any: The value found at the specified key path.
     """
     p = dic
-    for k in flat_key.split(sep):
+    for k in split_key(flat_key, sep):
         p = p[k]
     return p
 
 
-def deserialize_json(text: str) -> Any:
+def deserialize_json(text: Any) -> Any:
     """
     Deserializes a JSON string into a Python object.
 
     Args:
-        text (str): The JSON string to deserialize.
+        text (str or bytes): The JSON string to deserialize. Other objects are returned unchanged.
+
+    Returns:
+        Any: The deserialized Python object.
+    """
+    if isinstance(text, (bytes, bytearray, memoryview, str)):
+        return _loads(text)
+    return text
+
+
+def read_json(path: str) -> Any:
+    """
+    Reads and deserializes a JSON file.
+
+    Args:
+        path (str): The path of the file to read.
 
     Returns:
         Any: The deserialized Python object.
     """
-    return ast.literal_eval(str(text))
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
+
+def serialize_json_bytes(data: Any, indent: Optional[int] = 2) -> bytes:
+    """
+    Serializes a Python object into JSON bytes.
+
+    Args:
+        data (Any): The Python object to serialize.
+        indent (int, optional): The indentation, either None for compact output or 2. Defaults to 2.
+
+    Returns:
+        bytes: The serialized JSON bytes.
+
+    Raises:
+        ValueError: If the indentation is not supported.
+    """
+    if indent and indent != 2:
+        raise ValueError("Unsupported value for indent. Use None or 2.")
+    return _dumps(data, indent)
 
 
-def serialize_json(data: Any, indent: Optional[int] = 4) -> str:
+def serialize_json(data: Any, indent: Optional[int] = 2) -> str:
     """
     Serializes a Python object into a JSON string with indentation.
 
     Args:
         data (Any): The Python object to serialize.
-        indent (int, optional): The number of spaces to use for indentation. Defaults to 4.
+        indent (int, optional): The indentation, either None for compact output or 2. Defaults to 2.
 
     Returns:
         str: The serialized JSON string.
     """
-    return json.dumps(deserialize_json(data), indent=indent)
+    return serialize_json_bytes(data, indent).decode()
+
+
+def write_json(path: str, data: Any, indent: Optional[int] = 2):
+    """
+    Serializes a Python object and writes it to a JSON file.
+
+    Args:
+        path (str): The path of the file to write.
+        data (Any): The Python object to serialize.
+        indent (int, optional): The indentation, either None for compact output or 2. Defaults to 2.
+    """
+    with open(path, "wb") as f:
+        f.write(serialize_json_bytes(data, indent))
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_canonical(payload: bytes) -> str:
+    """
+    Computes the hex digest of a canonical JSON payload.
+
+    The optimizer frequently revisits the same parameters, so digests are memoized.
+
+    Args:
+        payload (bytes): The canonical JSON bytes.
+
+    Returns:
+        str: The hex digest of the payload.
+    """
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 
 def hash_json(data: Any) -> str:
     """
-    Computes the MD5 hash of a serialized JSON object.
+    Computes a 128-bit BLAKE2b hash of a serialized JSON object.
+
+    Keys are sorted before hashing so that equal objects always map to the same hash,
+    regardless of their insertion order.
 
     Args:
         data (Any): The Python object to hash.
 
     Returns:
-        str: The MD5 hash of the serialized JSON object.
+        str: The hex digest of the serialized JSON object.
     """
-    m = hashlib.md5(serialize_json(data, None).encode())
-    return m.hexdigest()
+    return _hash_canonical(_dumps(data, sort_keys=True))
@@ -5,7 +5,7 @@ from distutils.core import setup
 from setuptools import find_packages
 
 # List of runtime dependencies required by this built package
-install_requires = ["scikit-optimize", "flask"]
+install_requires = ["scikit-optimize", "flask", "orjson"]
 if sys.version_info <= (2, 7):
     install_requires += ["future", "typing"]
 
@@ -0,0 +1,11 @@
+import numpy as np
+
+
+def numerical_gradient(f, x, eps=1e-6):
+    """Central finite difference gradient of f at x, stacked along the last axis."""
+    grad = []
+    for i in range(len(x)):
+        dx = np.zeros_like(x)
+        dx[i] = eps
+        grad.append((f(x + dx) - f(x - dx)) / (2 * eps))
+    return np.stack(grad, axis=-1)
@@ -0,0 +1,98 @@
+import hashlib
+import importlib.util
+import json
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from hypered.utils import dict_utils
+from hypered.utils.dict_utils import hash_json, join_dicts, unwrap_dict, wrap_dict
+
+
+class TestUnwrapDict(unittest.TestCase):
+    def test_unwrap_dict(self):
+        dic = {"a": 1, "b": {"c": 2, "d": {"e": 3}}, "f": 4}
+        flat = unwrap_dict(dic)
+        self.assertEqual(flat, {"a": 1, "b.c": 2, "b.d.e": 3, "f": 4})
+        # Keys must come out in depth-first order
+        self.assertEqual(list(flat.keys()), ["a", "b.c", "b.d.e", "f"])
+
+    def test_unwrap_dict_separator(self):
+        dic = {"a": {"b": {"c": 1}}}
+        self.assertEqual(unwrap_dict(dic, sep="/"), {"a/b/c": 1})
+
+    def test_unwrap_dict_suffix(self):
+        dic = {"a": {"b": 1}}
+        self.assertEqual(unwrap_dict(dic, suffix="root"), {"root.a.b": 1})
+
+    def test_round_trip(self):
+        dic = {"a": 1, "b": {"c": 2, "d": {"e": 3}}}
+        self.assertEqual(wrap_dict(unwrap_dict(dic)), dic)
+
+
+class TestJoinDicts(unittest.TestCase):
+    def test_join_dicts(self):
+        objs = [{"a": 1, "b": {"c": 2}}, {"a": 3, "b": {"c": 4}}]
+        self.assertEqual(join_dicts(objs), {"a": [1, 3], "b": {"c": [2, 4]}})
+
+    def test_join_dicts_fn(self):
+        objs = [{"a": 1}, {"a": 3}]
+        self.assertEqual(join_dicts(objs, fn=sum), {"a": 4})
+
+    def test_join_dicts_empty(self):
+        self.assertEqual(join_dicts([]), {})
+
+    def test_join_dicts_dotted_keys(self):
+        objs = [{"val.acc": 1, "b": {}}, {"val.acc": 2, "b": {}}]
+        self.assertEqual(join_dicts(objs), {"val.acc": [1, 2], "b": {}})
+
+
+class TestHashJson(unittest.TestCase):
+    def test_hash_json_key_order(self):
+        self.assertEqual(hash_json({"a": 1, "b": 2}), hash_json({"b": 2, "a": 1}))
+        self.assertNotEqual(hash_json({"a": 1, "b": 2}), hash_json({"a": 2, "b": 1}))
+
+    def test_hash_json_matches_serialized(self):
+        data = {"b": [1, 2.5, {"z": None, "a": True}], "a": 'x"y', "c": {"\u00e9": 1}}
+        payload = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+        expected = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        self.assertEqual(hash_json(data), expected)
+
+
+def _load_without_orjson():
+    """Load a separate copy of dict_utils as if orjson was not installed."""
+    spec = importlib.util.spec_from_file_location("_dict_utils_json", dict_utils.__file__)
+    module = importlib.util.module_from_spec(spec)
+    with mock.patch.dict(sys.modules, {"orjson": None}):
+        spec.loader.exec_module(module)
+    return module
+
+
+class TestJsonFallback(unittest.TestCase):
+    def setUp(self):
+        self.fallback = _load_without_orjson()
+        self.data = {"b": [1, 2.5, None, True], "a": {"é": "x\ny", 3: np.float64(0.25)}, "c": np.arange(3)}
+
+    def test_uses_stdlib_json(self):
+        self.assertIsNone(self.fallback.orjson)
+
+    def test_serialize_matches_orjson(self):
+        for indent in (None, 2):
+            self.assertEqual(
+                self.fallback.serialize_json_bytes(self.data, indent=indent),
+                dict_utils.serialize_json_bytes(self.data, indent=indent),
+            )
+
+    def test_deserialize(self):
+        text = dict_utils.serialize_json_bytes(self.data)
+        self.assertEqual(self.fallback.deserialize_json(text), dict_utils.deserialize_json(text))
+        self.assertEqual(self.fallback.deserialize_json(memoryview(text)), dict_utils.deserialize_json(text))
+
+    def test_hash_matches_orjson(self):
+        self.assertEqual(self.fallback.hash_json(self.data), dict_utils.hash_json(self.data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from hypered.server.experiment_loader import ExperimentLoader
+
+
+class TestExperimentLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+        for i in range(3):
+            self._write_experiment("group", f"exp{i}", {"x": i}, {"loss": i * 10})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_experiment(self, group, name, params, results):
+        path = os.path.join(self.directory, group, name)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "params.json"), "w") as f:
+            json.dump(params, f)
+        with open(os.path.join(path, "results.json"), "w") as f:
+            json.dump(results, f)
+
+    def test_load_experiments(self):
+        el = ExperimentLoader(self.directory)
+        el.load_experiments()
+        self.assertEqual(list(el.experiment_data.keys()), ["group"])
+        group = el.experiment_data["group"]
+        self.assertEqual(sorted(group["params"]["x"]), [0, 1, 2])
+        self.assertEqual(sorted(group["results"]["loss"]), [0, 10, 20])
+        self.assertIsNone(group["best"])
+
+    def test_load_experiments_skips_incomplete(self):
+        os.makedirs(os.path.join(self.directory, "group", "pending"))
+        el = ExperimentLoader(self.directory)
+        el.load_experiments()
+        self.assertEqual(len(el.experiment_data["group"]["params"]["x"]), 3)
+
+    def test_load_experiments_best(self):
+        best = {"params": {"x": 0}, "results": {"loss": 0}}
+        with open(os.path.join(self.directory, "group", "best.json"), "w") as f:
+            json.dump(best, f)
+        el = ExperimentLoader(self.directory)
+        el.load_experiments()
+        group = el.experiment_data["group"]
+        self.assertEqual(group["best"], best)
+        self.assertEqual(len(group["params"]["x"]), 3)
+
+    def test_load_experiment_reloads_modified(self):
+        el = ExperimentLoader(self.directory)
+        path = os.path.join(self.directory, "group", "exp0")
+        self.assertEqual(el.load_experiment(path)[1], {"loss": 0})
+        self._write_experiment("group", "exp0", {"x": 0}, {"loss": 5})
+        results_path = os.path.join(path, "results.json")
+        st = os.stat(results_path)
+        os.utime(results_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(el.load_experiment(path)[1], {"loss": 5})
+
+    def test_load_experiments_reuses_unchanged_groups(self):
+        el = ExperimentLoader(self.directory)
+        el.load_experiments()
+        group = el.experiment_data["group"]
+        version = el.version
+        el.load_experiments()
+        self.assertIs(el.experiment_data["group"], group)
+        self.assertEqual(el.version, version)
+
+        self._write_experiment("group", "exp3", {"x": 3}, {"loss": 30})
+        el.load_experiments()
+        self.assertEqual(sorted(el.experiment_data["group"]["params"]["x"]), [0, 1, 2, 3])
+        self.assertGreater(el.version, version)
+
+    def test_load_experiments_forgets_deleted(self):
+        self._write_experiment("other", "exp0", {"x": 0}, {"loss": 0})
+        el = ExperimentLoader(self.directory)
+        el.load_experiments()
+        self.assertEqual(len(el._cache), 4)
+        self.assertEqual(len(el._group_cache), 2)
+
+        shutil.rmtree(os.path.join(self.directory, "other"))
+        shutil.rmtree(os.path.join(self.directory, "group", "exp0"))
+        el.load_experiments()
+        self.assertEqual(list(el.experiment_data.keys()), ["group"])
+        self.assertEqual(sorted(el._cache), sorted(os.path.join(self.directory, "group", f"exp{i}") for i in (1, 2)))
+        self.assertEqual(list(el._group_cache), [os.path.join(self.directory, "group")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,13 @@ import unittest
 import numpy as np
 from unittest.mock import MagicMock
 
-from hypered.optim.kernel import Kernel
+from hypered.optim.aquisition_fn import AcquisitionFn
+from hypered.optim.bayesian_optimization import _provides_gradient
+from hypered.optim.kernel import RBF, Kernel, Matern
 from hypered.optim.gaussian_process import GaussianProcess
 
+from gradient_utils import numerical_gradient
+
 
 class TestGaussianProcess(unittest.TestCase):
     def setUp(self):
@@ -29,10 +33,12 @@ class TestGaussianProcess(unittest.TestCase):
         # Check that the kernel function is called correctly
         self.kernel.assert_called_with(self.xs, self.xs)
 
-        # Check the covariance matrix and its inverse
+        # Check the covariance matrix and its factorization
         expected_k = np.array([[1, 0.5], [0.5, 1]]) + 1e-6 * np.eye(2)
         np.testing.assert_array_almost_equal(self.gp.k, expected_k)
-        np.testing.assert_array_almost_equal(self.gp.k_inv, np.linalg.inv(expected_k))
+        k_chol = self.gp.k_chol
+        np.testing.assert_array_almost_equal(k_chol.dot(k_chol.T), expected_k)
+        np.testing.assert_array_almost_equal(self.gp.alpha, np.linalg.solve(expected_k, self.ys))
 
     def test_predict(self):
         self.gp.fit(self.xs, self.ys)
@@ -53,12 +59,156 @@ class TestGaussianProcess(unittest.TestCase):
         k_s = np.array([[1, 0.1], [0.1, 1]])
         k_ss = np.array([[1, 0.2], [0.2, 1]]) + 1e-6 * np.eye(2)
 
-        expected_mu_s = k_s.dot(self.gp.k_inv).dot(self.ys)
-        expected_cov_s = k_ss - k_s.dot(self.gp.k_inv).dot(k_s.T)
+        k_inv = np.linalg.inv(np.array([[1, 0.5], [0.5, 1]]) + 1e-6 * np.eye(2))
+        expected_mu_s = k_s.dot(k_inv).dot(self.ys)
+        expected_cov_s = k_ss - k_s.dot(k_inv).dot(k_s.T)
 
         np.testing.assert_array_almost_equal(mu_s, expected_mu_s)
         np.testing.assert_array_almost_equal(cov_s, expected_cov_s)
 
 
+class TestGaussianProcessAddPoint(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.xs = rng.uniform(size=(6, 3))
+        self.ys = rng.uniform(size=6)
+        self.x_new = rng.uniform(size=(4, 3))
+
+    def test_add_point(self):
+        gp = GaussianProcess(kernel=RBF(scale=0.5))
+        gp.fit(self.xs[:4], self.ys[:4])
+        gp.add_point(self.xs[4], self.ys[4])
+        gp.add_point(self.xs[5], self.ys[5])
+
+        expected = GaussianProcess(kernel=RBF(scale=0.5))
+        expected.fit(self.xs, self.ys)
+
+        np.testing.assert_array_almost_equal(gp.xs, expected.xs)
+        np.testing.assert_array_almost_equal(gp.ys, expected.ys)
+        np.testing.assert_array_almost_equal(gp.k, expected.k)
+        np.testing.assert_array_almost_equal(gp.k_chol, expected.k_chol)
+        np.testing.assert_array_almost_equal(gp.alpha, expected.alpha)
+
+        mu_s, cov_s = gp.predict(self.x_new)
+        expected_mu_s, expected_cov_s = expected.predict(self.x_new)
+        np.testing.assert_array_almost_equal(mu_s, expected_mu_s)
+        np.testing.assert_array_almost_equal(cov_s, expected_cov_s)
+
+    def test_predict_std(self):
+        gp = GaussianProcess(kernel=RBF(scale=0.5))
+        gp.fit(self.xs, self.ys)
+
+        mu_s, std_s = gp.predict(self.x_new, return_std=True)
+        expected_mu_s, cov_s = gp.predict(self.x_new)
+        np.testing.assert_array_almost_equal(mu_s, expected_mu_s)
+        np.testing.assert_array_almost_equal(std_s, np.sqrt(np.diag(cov_s)))
+
+    def test_truncate(self):
+        gp = GaussianProcess(kernel=RBF(scale=0.5))
+        gp.fit(self.xs, self.ys)
+        gp.truncate(4)
+
+        expected = GaussianProcess(kernel=RBF(scale=0.5))
+        expected.fit(self.xs[:4], self.ys[:4])
+
+        np.testing.assert_array_almost_equal(gp.k_chol, expected.k_chol)
+        np.testing.assert_array_almost_equal(gp.alpha, expected.alpha)
+
+        mu_s, cov_s = gp.predict(self.x_new)
+        expected_mu_s, expected_cov_s = expected.predict(self.x_new)
+        np.testing.assert_array_almost_equal(mu_s, expected_mu_s)
+        np.testing.assert_array_almost_equal(cov_s, expected_cov_s)
+
+    def test_add_point_after_truncate(self):
+        gp = GaussianProcess(kernel=RBF(scale=0.5))
+        gp.fit(self.xs[:4], self.ys[:4])
+        gp.add_point(self.x_new[0], 1.0)
+        gp.add_point(self.x_new[1], 2.0)
+        gp.truncate(4)
+        gp.add_point(self.xs[4], self.ys[4])
+        gp.add_point(self.xs[5], self.ys[5])
+
+        expected = GaussianProcess(kernel=RBF(scale=0.5))
+        expected.fit(self.xs, self.ys)
+
+        np.testing.assert_array_almost_equal(gp.k, expected.k)
+        np.testing.assert_array_almost_equal(gp.k_chol, expected.k_chol)
+        np.testing.assert_array_almost_equal(gp.alpha, expected.alpha)
+
+    def test_refit_extension(self):
+        gp = GaussianProcess(kernel=RBF(scale=0.5))
+        gp.fit(self.xs[:3], self.ys[:3])
+        gp.fit(self.xs, self.ys)
+
+        expected = GaussianProcess(kernel=RBF(scale=0.5))
+        expected.fit(self.xs, self.ys)
+
+        np.testing.assert_array_almost_equal(gp.k, expected.k)
+        np.testing.assert_array_almost_equal(gp.k_chol, expected.k_chol)
+        np.testing.assert_array_almost_equal(gp.alpha, expected.alpha)
+
+        # Other training inputs are fitted from scratch.
+        gp.fit(self.x_new, self.ys[:4])
+        expected.fit(self.x_new, self.ys[:4])
+        np.testing.assert_array_almost_equal(gp.k_chol, expected.k_chol)
+
+    def test_float32(self):
+        expected = GaussianProcess(kernel=RBF(scale=0.5), sigma_n=1e-4)
+        expected.fit(self.xs[:4], self.ys[:4])
+        expected.add_point(self.xs[4], self.ys[4])
+
+        gp = GaussianProcess(kernel=RBF(scale=0.5), sigma_n=1e-4, dtype=np.float32)
+        gp.fit(self.xs[:4], self.ys[:4])
+        gp.add_point(self.xs[4], self.ys[4])
+        self.assertEqual(gp.k_chol.dtype, np.float32)
+
+        mu_s, std_s = gp.predict(self.x_new, return_std=True)
+        expected_mu_s, expected_std_s = expected.predict(self.x_new, return_std=True)
+        self.assertEqual(mu_s.dtype, np.float32)
+        np.testing.assert_allclose(mu_s, expected_mu_s, rtol=1e-3, atol=1e-3)
+        np.testing.assert_allclose(std_s, expected_std_s, rtol=1e-2, atol=1e-3)
+
+
+class TestGaussianProcessGradient(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.gp = GaussianProcess(kernel=Matern(nu=2.5, scale=0.5))
+        self.gp.fit(rng.uniform(size=(6, 3)), rng.uniform(size=6))
+        self.x = rng.uniform(size=3)
+
+    def test_predict_with_grad(self):
+        mu, sigma, dmu, dsigma = self.gp.predict_with_grad(self.x)
+        expected_mu, expected_sigma = self.gp.predict(self.x.reshape(1, -1), return_std=True)
+        self.assertAlmostEqual(mu, expected_mu[0])
+        self.assertAlmostEqual(sigma, expected_sigma[0])
+
+        def predict(x):
+            return np.array(self.gp.predict(x.reshape(1, -1), return_std=True))[:, 0]
+
+        expected = numerical_gradient(predict, self.x)
+        np.testing.assert_array_almost_equal(dmu, expected[0])
+        np.testing.assert_array_almost_equal(dsigma, expected[1])
+
+    def test_acquisition_fn_gradient(self):
+        for name in ("UCB", "EI"):
+            acquisition_fn = AcquisitionFn.create(name)
+            value, grad = acquisition_fn.value_and_grad(self.gp, self.x, 0.2)
+            self.assertAlmostEqual(value, acquisition_fn(self.gp, self.x.reshape(1, -1), 0.2)[0])
+            expected = numerical_gradient(lambda x: acquisition_fn(self.gp, x.reshape(1, -1), 0.2)[0], self.x)
+            np.testing.assert_array_almost_equal(grad, expected)
+
+    def test_provides_gradient(self):
+        self.assertTrue(_provides_gradient(AcquisitionFn.create("EI"), self.gp))
+
+        class NoGradientKernel(Kernel):
+            NAME = "NoGradientKernel"
+
+            def __call__(self, x1, x2):
+                return RBF()(x1, x2)
+
+        gp = GaussianProcess(kernel=NoGradientKernel())
+        self.assertFalse(_provides_gradient(AcquisitionFn.create("EI"), gp))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,8 @@ from scipy.spatial.distance import cdist
 
 from hypered.optim.kernel import RBF, Matern
 
+from gradient_utils import numerical_gradient
+
 
 class TestRBFKernel(unittest.TestCase):
     def test_rbf_kernel(self):
@@ -24,6 +26,19 @@ class TestRBFKernel(unittest.TestCase):
         result = rbf(x1, x2)
         np.testing.assert_array_almost_equal(result, expected_result)
 
+    def test_rbf_kernel_diag(self):
+        rbf = RBF(scale=2.0)
+        x = np.array([[0, 0], [1, 1], [2, 3]])
+        np.testing.assert_array_almost_equal(rbf.diag(x), np.diag(rbf(x, x)))
+
+    def test_rbf_kernel_float32(self):
+        rbf = RBF(scale=2.0)
+        x1 = np.random.RandomState(0).uniform(size=(4, 3))
+        x2 = np.random.RandomState(1).uniform(size=(5, 3))
+        result = rbf(x1.astype(np.float32), x2.astype(np.float32))
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, rbf(x1, x2), rtol=1e-5)
+
 
 class TestMaternKernel(unittest.TestCase):
     def test_matern_kernel_nu_0_5(self):
@@ -58,6 +73,21 @@ class TestMaternKernel(unittest.TestCase):
         result = matern(x1, x2)
         np.testing.assert_array_almost_equal(result, expected_result)
 
+    def test_matern_kernel_different_scale(self):
+        matern = Matern(nu=0.5, scale=2.0)
+        x1 = np.random.RandomState(0).uniform(size=(4, 3))
+        x2 = np.vstack([x1[:2], np.random.RandomState(1).uniform(size=(3, 3))])
+
+        expected_result = np.exp(-cdist(x1 / 2.0, x2 / 2.0, metric="euclidean"))
+        result = matern(x1, x2)
+        np.testing.assert_allclose(result, expected_result, atol=1e-7)
+
+    def test_matern_kernel_diag(self):
+        x = np.array([[0, 0], [1, 1], [2, 3]])
+        for nu in (0.5, 1.5, 2.5):
+            matern = Matern(nu=nu, scale=2.0)
+            np.testing.assert_array_almost_equal(matern.diag(x), np.diag(matern(x, x)))
+
     def test_matern_kernel_invalid_nu(self):
         with self.assertRaises(ValueError):
             matern = Matern(nu=1.0, scale=1.0)
@@ -66,5 +96,41 @@ class TestMaternKernel(unittest.TestCase):
             matern(x1, x2)
 
 
+class TestKernelExtend(unittest.TestCase):
+    def test_extend(self):
+        rng = np.random.RandomState(0)
+        xs_old = rng.uniform(size=(5, 2))
+        xs_new = rng.uniform(size=(3, 2))
+        xs = np.vstack([xs_old, xs_new])
+        for kernel in (RBF(scale=0.7), Matern(nu=1.5, scale=0.7)):
+            k = kernel.extend(kernel(xs_old, xs_old), xs_old, xs_new)
+            np.testing.assert_array_almost_equal(k, kernel(xs, xs))
+
+
+class TestKernelGradient(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.x = rng.uniform(size=3)
+        self.x2 = rng.uniform(size=(5, 3))
+
+    def check_gradient(self, kernel):
+        k, dk = kernel.gradient(self.x, self.x2)
+        np.testing.assert_array_almost_equal(k, kernel(self.x.reshape(1, -1), self.x2)[0])
+        expected_dk = numerical_gradient(lambda x: kernel(x.reshape(1, -1), self.x2)[0], self.x)
+        np.testing.assert_array_almost_equal(dk, expected_dk)
+
+    def test_rbf_gradient(self):
+        self.check_gradient(RBF(scale=0.7))
+
+    def test_matern_gradient(self):
+        for nu in (0.5, 1.5, 2.5):
+            self.check_gradient(Matern(nu=nu, scale=0.7))
+
+    def test_gradient_at_training_point(self):
+        for kernel in (RBF(scale=0.7), Matern(nu=0.5), Matern(nu=1.5), Matern(nu=2.5)):
+            _, dk = kernel.gradient(self.x2[0], self.x2)
+            np.testing.assert_array_equal(dk[0], np.zeros(3))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,266 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import hypered as hp
+from hypered.interface import misc
+from hypered.optim.bayesian_optimization import bayesian_optimization
+from hypered.optim.space import Categorical, Real
+
+# Replies to each line of params on stdin with a line of results on stdout.
+WORKER_SCRIPT = """
+import json
+import sys
+
+for line in sys.stdin:
+    params = json.loads(line)
+    print(json.dumps({"loss": (params["x"] - 0.5) ** 2}), flush=True)
+"""
+
+# Reads the params from stdin and writes the results to the path given as argument.
+STDIN_SCRIPT = """
+import json
+import sys
+
+params = json.load(sys.stdin)
+with open(sys.argv[1], "w") as f:
+    json.dump({"loss": (params["x"] - 0.5) ** 2}, f)
+"""
+
+
+class TestOptimizeFunction(unittest.TestCase):
+    def test_batched(self):
+        calls = []
+
+        def function(params_list):
+            calls.append([params["c"] for params in params_list])
+            return [{"loss": float(params["c"])} for params in params_list]
+
+        best = hp.optimize(
+            name="test",
+            objective=hp.minimize("loss"),
+            params={"c": hp.categorical([0, 1, 2])},
+            function=function,
+            batched=True,
+            random_starts=4,
+            iterations=8,
+            n_jobs=2,
+            seed=0,
+        )
+        self.assertEqual(best["params"], {"c": 0})
+        self.assertEqual(best["loss"], 0.0)
+        # Later points are proposed in batches of n_jobs.
+        self.assertTrue(all(len(batch) <= 2 for batch in calls[1:]))
+        # Each set of params is sent to the function at most once.
+        evaluated = [c for batch in calls for c in batch]
+        self.assertEqual(len(evaluated), len(set(evaluated)))
+
+    def test_n_jobs(self):
+        calls = []
+
+        def function(params):
+            calls.append(params["c"])
+            return {"loss": float(params["c"])}
+
+        best = hp.optimize(
+            name="test",
+            objective=hp.minimize("loss"),
+            params={"c": hp.categorical([0, 1, 2]), "fixed": 1},
+            function=function,
+            random_starts=4,
+            iterations=8,
+            n_jobs=2,
+            seed=0,
+        )
+        self.assertEqual(best["params"], {"c": 0})
+        self.assertEqual(len(calls), len(set(calls)))
+
+    def test_n_jobs_duplicates(self):
+        calls = []
+
+        def function(params):
+            calls.append(params["c"])
+            # Keep the experiment running while the other threads get the same params.
+            time.sleep(0.05)
+            return {"loss": float(params["c"])}
+
+        hp.optimize(
+            name="test",
+            objective=hp.minimize("loss"),
+            params={"c": hp.categorical([0, 1])},
+            function=function,
+            random_starts=4,
+            iterations=8,
+            n_jobs=4,
+            seed=0,
+        )
+        self.assertEqual(sorted(calls), [0, 1])
+
+    def test_params_not_shared(self):
+        calls = []
+
+        def function(params):
+            calls.append((params["model"]["lr"], params["data"]["batch"]))
+            params["data"]["batch"] *= 2
+            params["model"]["lr"] = None
+            return {"loss": params["x"]}
+
+        best = hp.optimize(
+            name="test",
+            objective=hp.minimize("loss"),
+            params={"x": hp.real(0.0, 1.0), "model": {"lr": hp.real(0.1, 0.2)}, "data": {"batch": 32}},
+            function=function,
+            random_starts=3,
+            iterations=4,
+            seed=0,
+        )
+        self.assertTrue(all(0.1 <= lr <= 0.2 and batch == 32 for lr, batch in calls))
+        self.assertEqual(set(best["params"]), {"x", "model"})
+        self.assertEqual(set(best["params"]["model"]), {"lr"})
+
+    def test_nan_loss(self):
+        def function(params):
+            return {"loss": float("nan") if params["c"] == 0 else float(params["c"])}
+
+        # Only the selection of the best experiment is tested, so evaluate fixed points.
+        def evaluate(loss_fn, vars, **kwargs):
+            return [(values, loss_fn(values)) for values in ([0], [2], [1], [0])]
+
+        with mock.patch("hypered.interface.optimize.bayesian_optimization", side_effect=evaluate):
+            best = hp.optimize(
+                name="test",
+                objective=hp.minimize("loss"),
+                params={"c": hp.categorical([0, 1, 2])},
+                function=function,
+            )
+        self.assertEqual(best["params"], {"c": 1})
+
+    def test_seed(self):
+        def run(seed):
+            losses = []
+
+            def function(params):
+                losses.append((params["x"] - 0.5) ** 2)
+                return {"loss": losses[-1]}
+
+            hp.optimize(
+                name="test",
+                objective=hp.minimize("loss"),
+                params={"x": hp.real(-1.0, 1.0)},
+                function=function,
+                random_starts=3,
+                iterations=5,
+                seed=seed,
+            )
+            return losses
+
+        self.assertEqual(run(1), run(1))
+        self.assertNotEqual(run(1), run(2))
+
+    def test_invalid_n_jobs(self):
+        function = mock.Mock(return_value={"loss": 0.0})
+        for n_jobs in (0, -1):
+            with self.assertRaises(ValueError):
+                hp.optimize(
+                    name="test",
+                    objective=hp.minimize("loss"),
+                    params={"x": hp.real(0.0, 1.0)},
+                    function=function,
+                    n_jobs=n_jobs,
+                )
+            with self.assertRaises(ValueError):
+                bayesian_optimization(function, [Real(0.0, 1.0)], n_jobs=n_jobs)
+        function.assert_not_called()
+
+    def test_bayesian_optimization_seed(self):
+        def run(seed):
+            return bayesian_optimization(
+                lambda x: (x[0] - 0.3) ** 2 + (x[1] != "a"),
+                [Real(-1.0, 1.0), Categorical(["a", "b"])],
+                n_initial_points=3,
+                n_calls=5,
+                seed=seed,
+            )
+
+        self.assertEqual(run(3), run(3))
+
+
+class TestOptimizeBinary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(misc, "OUTPUT_DIR", os.path.join(self.tmp.name, "experiments"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write_script(self, source):
+        path = os.path.join(self.tmp.name, "script.py")
+        with open(path, "w") as f:
+            f.write(source)
+        return path
+
+    def _read_best(self):
+        with open(os.path.join(misc.OUTPUT_DIR, "test", "best.json")) as f:
+            return json.load(f)
+
+    def _check_experiments(self, n):
+        group_dir = os.path.join(misc.OUTPUT_DIR, "test")
+        experiment_dirs = [entry.path for entry in os.scandir(group_dir) if entry.is_dir()]
+        self.assertEqual(len(experiment_dirs), n)
+        for experiment_dir in experiment_dirs:
+            with open(os.path.join(experiment_dir, "params.json")) as f:
+                params = json.load(f)
+            with open(os.path.join(experiment_dir, "results.json")) as f:
+                results = json.load(f)
+            self.assertAlmostEqual(results["loss"], (params["x"] - 0.5) ** 2)
+
+    def test_persistent(self):
+        script = self._write_script(WORKER_SCRIPT)
+        hp.optimize(
+            name="test",
+            objective=hp.minimize("loss"),
+            params={"x": hp.real(-1.0, 1.0)},
+            binary=f"{sys.executable} {script}",
+            persistent=True,
+            random_starts=3,
+            iterations=5,
+            n_jobs=2,
+            seed=0,
+        )
+        self._check_experiments(5)
+        best = self._read_best()
+        self.assertAlmostEqual(best["results"]["loss"], (best["params"]["x"] - 0.5) ** 2)
+
+    def test_persistent_placeholders(self):
+        with self.assertRaises(ValueError):
+            hp.optimize(
+                name="test",
+                objective=hp.minimize("loss"),
+                params={"x": hp.real(-1.0, 1.0)},
+                binary=f"{sys.executable} worker.py {{params_path}}",
+                persistent=True,
+            )
+
+    def test_stdin(self):
+        script = self._write_script(STDIN_SCRIPT)
+        hp.optimize(
+            name="test",
+            objective=hp.minimize("loss"),
+            params={"x": hp.real(-1.0, 1.0)},
+            binary=f"{sys.executable} {script} {{results_path}}",
+            stdin=True,
+            random_starts=3,
+            iterations=4,
+            seed=0,
+        )
+        self._check_experiments(4)
+        best = self._read_best()
+        self.assertAlmostEqual(best["results"]["loss"], (best["params"]["x"] - 0.5) ** 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+
+from hypered.optim.space import Space, Real, Integer, Categorical
+
+
+class TestSpace(unittest.TestCase):
+    def setUp(self):
+        self.space = Space([Real(-1.0, 3.0), Categorical(["a", "b", "c"]), Integer(2, 10)])
+
+    def test_denormalize(self):
+        x = np.array([0.25, 0.1, 0.7, 0.2, 0.5])
+        self.assertEqual(self.space.denormalize(x), [0.0, "b", 6])
+
+    def test_denormalize_categorical(self):
+        categorical = Categorical(["a", "b", "c"])
+        self.assertEqual(categorical.denormalize(np.array([0.2, 0.7, 0.7])), "b")
+        many = Categorical(list(range(20)))
+        x = np.random.RandomState(0).uniform(size=20)
+        self.assertEqual(many.denormalize(x), int(np.argmax(x)))
+
+    def test_denormalize_batch(self):
+        xs = np.random.RandomState(0).uniform(size=(20, self.space.size))
+        self.assertEqual(self.space.denormalize_batch(xs), [self.space.denormalize(x) for x in xs])
+
+    def test_denormalize_batch_types(self):
+        xs = self.space.sample(3)
+        for real, category, integer in self.space.denormalize_batch(xs):
+            self.assertIsInstance(real, float)
+            self.assertIn(category, ["a", "b", "c"])
+            self.assertIsInstance(integer, int)
+
+    def test_denormalize_subclass(self):
+        class LogReal(Real):
+            def denormalize(self, x):
+                return 10 ** super().denormalize(x)
+
+        space = Space([LogReal(-4.0, 0.0), Integer(2, 10)])
+        x = np.array([0.5, 0.5])
+        self.assertAlmostEqual(space.denormalize(x)[0], 0.01)
+        self.assertAlmostEqual(space.denormalize_batch(x[None])[0][0], 0.01)
+
+    def test_sample_seed(self):
+        vars = [Real(0.0, 1.0), Categorical(["a", "b"])]
+        np.testing.assert_array_equal(Space(vars, seed=1).sample(5), Space(vars, seed=1).sample(5))
+        self.assertFalse(np.array_equal(Space(vars, seed=1).sample(5), Space(vars, seed=2).sample(5)))
+
+    def test_sample_out(self):
+        vars = [Real(0.0, 1.0), Categorical(["a", "b"])]
+        out = np.empty((4, 3))
+        self.assertIs(Space(vars, seed=1).sample(4, out=out), out)
+        np.testing.assert_array_equal(out, Space(vars, seed=1).sample(4))
+        with self.assertRaises(ValueError):
+            Space(vars).sample(5, out=out)
+
+
+if __name__ == "__main__":
+    unittest.main()